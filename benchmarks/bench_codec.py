@@ -0,0 +1,134 @@
+"""Microbenchmark: time from "slot chosen" to request bytes ready for the wire.
+
+Run from the repo root:
+
+    python benchmarks/bench_codec.py [-n ITERATIONS] [--rows ROWS]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+
+from london_golf.api_client import _open_foursomes, build_cart_body, build_lock_body  # noqa: E402
+from london_golf.codec import JSON_BACKEND, loads  # noqa: E402
+from london_golf.metadata import (  # noqa: E402
+    RateMeta,
+    _cart_product_lineups,
+    _cart_teetime_notes,
+    _cart_terms_and_conditions,
+)
+from london_golf.models import TeeTime  # noqa: E402
+
+CART_URL = "https://example.invalid/shopping-cart/abc/cart-item"
+
+
+def _tee_time(i: int) -> dict:
+    hour, minute = divmod(i * 8, 60)
+    return {
+        "teetime": f"2026-11-09T{11 + hour % 12:02d}:{minute:02d}:00.000Z",
+        "courseId": "54f14d2e0c8ad60378b03b1c",
+        "bookedPlayers": 0,
+        "maxPlayers": 4,
+        "rates": [
+            {
+                "_id": str(1000 + i % 3),
+                "name": "18 Holes Walking",
+                "holes": 18,
+                "greenFeeWalking": 5400,
+                "allowedPlayers": [1, 2, 3, 4],
+                "isSimulator": False,
+                "golfnow": {"GolfFacilityId": "9714", "GolfCourseId": 22123.0},
+                "description": "Walking rate " * 8,
+            }
+        ],
+    }
+
+
+def _legacy_cart_bytes(tee_time_info: dict) -> bytes:
+    """Pre-metadata path: parse the rate with fallbacks, build a dict, stdlib encode."""
+    meta = RateMeta.from_tee_time(tee_time_info)
+    rate = tee_time_info["rates"][0]
+    price = float(rate["greenFeeWalking"]) / 100.0
+    data = {
+        "item": {
+            "facilityId": meta.facility_id,
+            "type": "TeeTime",
+            "extra": {
+                "teetime": tee_time_info["teetime"],
+                "players": meta.players,
+                "groupSize": 1,
+                "price": price,
+                "isPnasSelected": bool(tee_time_info.get("isPnasSelected", meta.is_pnas)),
+                "rate": {
+                    "holes": meta.holes,
+                    "price": price,
+                    "rateId": meta.rate_id,
+                    "rateSetId": meta.rate_set_id,
+                    "name": meta.name,
+                    "transactionFees": 0,
+                    "transportation": meta.transportation,
+                    "isSimulator": meta.is_simulator,
+                },
+                "productLineups": _cart_product_lineups(tee_time_info, rate),
+                "termsAndConditions": _cart_terms_and_conditions(tee_time_info, rate),
+                "teetimeNotes": _cart_teetime_notes(tee_time_info, rate),
+            },
+        }
+    }
+    return httpx.Request("POST", CART_URL, json=data).read()
+
+
+def _template_cart_bytes(tee_time: TeeTime) -> bytes:
+    body = build_cart_body(tee_time)
+    return httpx.Request("POST", CART_URL, content=body).read()
+
+
+def _report(label: str, seconds: float, iterations: int) -> None:
+    print(f"{label:<38} {seconds / iterations * 1e6:9.2f} us/op")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", type=int, default=20000, help="iterations per case")
+    parser.add_argument("--rows", type=int, default=500, help="tee times in the decode sheet")
+    args = parser.parse_args()
+
+    sample = _tee_time(7)
+    (tee,) = _open_foursomes([{"teetimes": [sample]}])
+    sheet = json.dumps([{"teetimes": [_tee_time(i) for i in range(args.rows)]}]).encode()
+
+    print(f"JSON backend: {JSON_BACKEND}")
+    cases = [
+        ("cart: legacy parse + stdlib json", lambda: _legacy_cart_bytes(sample)),
+        ("cart: template render", lambda: _template_cart_bytes(tee)),
+        ("lock: template render", lambda: build_lock_body(tee)),
+    ]
+    for label, func in cases:
+        _report(label, timeit.timeit(func, number=args.n), args.n)
+
+    decode_n = max(1, args.n // 100)
+    _report(
+        f"decode sheet ({args.rows} rows): stdlib",
+        timeit.timeit(lambda: json.loads(sheet), number=decode_n),
+        decode_n,
+    )
+    _report(
+        f"decode sheet ({args.rows} rows): codec",
+        timeit.timeit(lambda: loads(sheet), number=decode_n),
+        decode_n,
+    )
+    _report(
+        f"sheet -> TeeTime ({args.rows} rows)",
+        timeit.timeit(lambda: _open_foursomes(loads(sheet)), number=decode_n),
+        decode_n,
+    )
+
+
+if __name__ == "__main__":
+    main()
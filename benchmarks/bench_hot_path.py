@@ -0,0 +1,286 @@
+"""Microbenchmarks for the CPU-bound search and booking hot path, with a regression gate.
+
+Run from the repo root:
+
+    python benchmarks/bench_hot_path.py                  # compare against baseline.json
+    python benchmarks/bench_hot_path.py --save-baseline  # record a new baseline
+    python benchmarks/bench_hot_path.py --rows 100 1000 --threshold 0.3
+
+Timings are divided by a fixed pure-Python calibration loop before they are compared,
+so a baseline recorded on one machine stays meaningful on another. The run exits with
+status 1 when any case is slower than its baseline by more than ``--threshold``.
+I/O-bound cases (``UNGATED``) are reported but never fail the run, and nothing is gated
+when the JSON backend or Python version differs from the baseline's.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import redis  # noqa: E402
+import yaml  # noqa: E402
+
+from london_golf.api_client import _open_foursomes, build_cart_body  # noqa: E402
+from london_golf.cache import CacheManager  # noqa: E402
+from london_golf.codec import JSON_BACKEND, dumps, loads  # noqa: E402
+from london_golf.config_loader import load_config  # noqa: E402
+from london_golf.schedule import (  # noqa: E402
+    booking_window,
+    convert_tz,
+    convert_tz_eastern_to_utc,
+    convert_tz_utc_to_eastern,
+    window_candidates,
+)
+
+BASELINE_FILE = Path(__file__).resolve().parent / "baseline.json"
+BOOK_DATE = "2026-11-09"
+DEFAULT_ROWS = (100, 1000, 10000)
+DEFAULT_THRESHOLD = 0.25
+# Disk and network bound: a CPU calibration loop says nothing about their speed.
+UNGATED = frozenset({"cache.set[file]", "cache.get[redis] x100", "cache.set[redis]"})
+
+
+def _calibrate() -> float:
+    """Seconds per op of a fixed dict/str workload; the unit all cases are scored in."""
+
+    def work() -> int:
+        table = {}
+        for i in range(200):
+            table[f"k{i}"] = i * 2
+        return sum(table.values())
+
+    return min(timeit.repeat(work, number=200, repeat=5)) / 200
+
+
+def _sheet(rows: int) -> bytes:
+    """Synthetic tee sheet: ``rows`` foursomes spread over the day, three rates."""
+    teetimes = []
+    for i in range(rows):
+        minute = (i * 7) % (12 * 60)
+        hour, minute = divmod(minute, 60)
+        teetimes.append(
+            {
+                "teetime": f"{BOOK_DATE}T{11 + hour:02d}:{minute:02d}:00.000Z",
+                "courseId": "54f14d2e0c8ad60378b03b1c",
+                "bookedPlayers": 0 if i % 5 else 2,
+                "maxPlayers": 4,
+                "rates": [
+                    {
+                        "_id": str(1000 + i % 3),
+                        "name": "18 Holes Walking",
+                        "holes": 18,
+                        "greenFeeWalking": 5400,
+                        "allowedPlayers": [1, 2, 3, 4],
+                        "isSimulator": False,
+                        "golfnow": {"GolfFacilityId": "9714", "GolfCourseId": 22123.0},
+                    }
+                ],
+            }
+        )
+    return dumps([{"teetimes": teetimes}])
+
+
+def _cache_cases(log: logging.Logger, tmp: Path, redis_url: Optional[str]) -> Dict[str, Callable]:
+    backends = {
+        "memory": CacheManager({}, log, cache_file=None),
+        "file": CacheManager({}, log, cache_file=str(tmp / "bench_cache.json")),
+    }
+    if redis_url:
+        client = redis.Redis.from_url(redis_url)
+        try:
+            client.ping()
+            host, port = (
+                client.connection_pool.connection_kwargs["host"],
+                client.connection_pool.connection_kwargs["port"],
+            )
+            backends["redis"] = CacheManager({"redis": {"host": host, "port": port}}, log)
+        except (redis.exceptions.RedisError, OSError) as exc:
+            print(f"redis backend skipped: {exc}")
+    for cache in backends.values():
+        for i in range(200):
+            cache.set(f"bench:{i}", "OK")
+    keys = [f"bench:{i}" for i in range(100)]
+    cases = {}
+    for name, cache in backends.items():
+        cases[f"cache.get[{name}] x100"] = lambda c=cache: [c.get(k) for k in keys]
+        cases[f"cache.set[{name}]"] = lambda c=cache: c.set("bench:42", "OK")
+    return cases
+
+
+def _config_case(tmp: Path) -> Callable:
+    path = tmp / "bench_config.yaml"
+    weekdays = {day: None for day in ("MON", "TUE", "WED", "THU", "FRI")}
+    weekdays["SAT"] = {"start_time": "07:00", "duration": 120, "course": ["CLAS", "TRAD"]}
+    weekdays["SUN"] = {
+        "book_date": "2026-11-01..2026-11-30",
+        "start_time": "08:00",
+        "course": "CLAS",
+    }
+    data = {
+        "course": {
+            "CLAS": {"code": 9710, "name": "Classic"},
+            "TRAD": {"code": 9714, "name": "Trad"},
+        },
+        "authentication": {f"user{i}": {"userid": f"u{i}", "password": "x"} for i in range(10)},
+        "schedule": {f"task{i}": {"auth": f"user{i}", "weekdays": weekdays} for i in range(10)},
+    }
+    path.write_text(yaml.safe_dump(data, sort_keys=False), encoding="utf-8")
+    return lambda: load_config(path)
+
+
+def build_cases(rows: List[int], redis_url: Optional[str], tmp: Path) -> Dict[str, Callable]:
+    log = logging.getLogger("london_golf.bench")
+    log.disabled = True
+    cases: Dict[str, Callable] = {
+        "convert_tz": lambda: convert_tz("2026-11-09 14:10:00", "UTC", "US/Eastern"),
+        "convert_tz_eastern_to_utc": lambda: convert_tz_eastern_to_utc("2026-11-09 09:10:00"),
+        "convert_tz_utc_to_eastern": lambda: convert_tz_utc_to_eastern("2026-11-09 14:10:00"),
+    }
+    window = booking_window(BOOK_DATE, "09:00", 180)
+    seen = CacheManager({}, log, cache_file=None)
+    for n in rows:
+        sheet = _sheet(n)
+        tee_times = _open_foursomes(loads(sheet))
+        cases[f"sheet_to_teetimes[{n}]"] = lambda s=sheet: _open_foursomes(loads(s))
+        cases[f"window_candidates[{n}]"] = lambda t=tee_times: window_candidates(t, window, seen)
+    sample = _open_foursomes(loads(_sheet(2)))[0]
+    cases["cart_body"] = lambda: build_cart_body(sample)
+    cases.update(_cache_cases(log, tmp, redis_url))
+    cases["load_config"] = _config_case(tmp)
+    return cases
+
+
+def _time_case(func: Callable, budget: float) -> float:
+    """Best-of-5 seconds per call, with ``number`` sized to about ``budget`` seconds."""
+    timer = timeit.Timer(func)
+    number, elapsed = timer.autorange()
+    number = max(1, int(number * budget / max(elapsed, 1e-9) / 5))
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def run(
+    rows: List[int],
+    redis_url: Optional[str],
+    budget: float,
+    rounds: int,
+    only: Optional[List[str]] = None,
+) -> Dict[str, object]:
+    """Time every case (or just ``only``) ``rounds`` times, interleaved, keeping the fastest.
+
+    Interleaving rounds (and recalibrating each round) keeps a burst of machine noise
+    from skewing one case against the rest.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = build_cases(rows, redis_url, Path(tmp))
+        if only is not None:
+            cases = {name: cases[name] for name in only}
+        unit = float("inf")
+        best: Dict[str, float] = {}
+        for _ in range(rounds):
+            unit = min(unit, _calibrate())
+            for name, func in cases.items():
+                seconds = _time_case(func, budget)
+                best[name] = min(best.get(name, seconds), seconds)
+    results = {name: {"us": sec * 1e6, "score": sec / unit} for name, sec in best.items()}
+    return {
+        "python": platform.python_version(),
+        "json_backend": JSON_BACKEND,
+        "calibration_us": unit * 1e6,
+        "cases": results,
+    }
+
+
+def _python_minor(version: str) -> str:
+    return ".".join(version.split(".")[:2])
+
+
+def mismatch(current: Dict, baseline: Dict) -> Optional[str]:
+    """Why ``baseline`` cannot gate ``current`` (other JSON backend or Python), or None."""
+    if current["json_backend"] != baseline.get("json_backend"):
+        return f"JSON backend {current['json_backend']} vs baseline {baseline.get('json_backend')}"
+    if _python_minor(current["python"]) != _python_minor(str(baseline.get("python", ""))):
+        return f"Python {current['python']} vs baseline {baseline.get('python')}"
+    return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Print a comparison table; return the gated cases slower than baseline by > threshold."""
+    regressions = []
+    print(f"{'case':<34} {'us/op':>12} {'base us/op':>12} {'change':>8}")
+    for name, result in current["cases"].items():
+        base = baseline.get("cases", {}).get(name)
+        if base is None:
+            print(f"{name:<34} {result['us']:12.2f} {'-':>12} {'new':>8}")
+            continue
+        change = result["score"] / base["score"] - 1.0
+        regressed = change > threshold and name not in UNGATED
+        flag = "  REGRESSION" if regressed else "  (not gated)" if name in UNGATED else ""
+        print(f"{name:<34} {result['us']:12.2f} {base['us']:12.2f} {change:+8.1%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=list(DEFAULT_ROWS))
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--budget", type=float, default=0.1, help="seconds per case and repeat")
+    parser.add_argument("--rounds", type=int, default=3, help="interleaved rounds per case")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--redis",
+        default=os.environ.get("LONDON_GOLF_BENCH_REDIS"),
+        metavar="URL",
+        help="redis://host:port to include the Redis cache backend",
+    )
+    args = parser.parse_args()
+
+    current = run(args.rows, args.redis, args.budget, args.rounds)
+    print(
+        f"JSON backend: {current['json_backend']}  calibration: {current['calibration_us']:.2f} us"
+    )
+    if args.save_baseline:
+        args.baseline.write_text(
+            json.dumps(current, indent=2, sort_keys=True) + "\n", encoding="utf-8"
+        )
+        compare(current, current, args.threshold)
+        print(f"baseline written to {args.baseline}")
+        return
+    if not args.baseline.is_file():
+        sys.exit(f"no baseline at {args.baseline}; run with --save-baseline first")
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    reason = mismatch(current, baseline)
+    if reason is not None:
+        compare(current, baseline, float("inf"))
+        print(f"not gating: {reason}; record a baseline for this setup with --save-baseline")
+        return
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        # Shared CI machines are noisy: a regression only counts if a re-run confirms it.
+        print(f"re-checking {len(regressions)} case(s)...")
+        recheck = run(args.rows, args.redis, args.budget, args.rounds, only=regressions)
+        for name, result in recheck["cases"].items():
+            if result["score"] < current["cases"][name]["score"]:
+                current["cases"][name] = result
+        regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(
+            f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        sys.exit(1)
+    print("no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,20 @@
-"""London Golf automated tee-time booking."""
+"""London Golf automated tee-time booking.
 
-__all__ = ["__version__"]
+Besides the CLI, the package exposes an async API (:mod:`london_golf.stream`):
+``watch_tee_times`` streams open slots and ``hold_tee_time`` locks and carts one.
+They are imported on first access, so ``import london_golf`` stays cheap.
+"""
+
+__all__ = ["__version__", "Slot", "hold_tee_time", "watch_tee_times"]
 
 __version__ = "2.0.0"
+
+_STREAM_API = ("Slot", "hold_tee_time", "watch_tee_times")
+
+
+def __getattr__(name: str):
+    if name in _STREAM_API:
+        from london_golf import stream  # pylint: disable=import-outside-toplevel
+
+        return getattr(stream, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
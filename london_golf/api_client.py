@@ -1,67 +1,30 @@
 """HTTP client for Kenna tee-time, cart, and lock endpoints (async via httpx)."""
 
-import contextlib
+import asyncio
+import hashlib
 import logging
-from typing import Any, Dict, List, Mapping, MutableMapping, Union
+import weakref
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, MutableMapping, Optional, Tuple, Union
 
 import httpx
 
-from london_golf.constants import ENDPOINTS, HEADERS
+from london_golf.codec import BodyTemplate, loads
+from london_golf.constants import ENDPOINTS, HEADERS, LOCK_EXPIRES_IN, LOCK_SLOTS, SHEET_SHARE_TTL
+from london_golf.deadline import request_timeout
+from london_golf.logging_config import sampled
+from london_golf.metadata import RateMeta, get_metadata_store, tee_cart_fields
+from london_golf.models import TeeTime
+from london_golf.recorder import Recorder, RecordingTransport
 
 HeaderMap = Union[Mapping[str, str], MutableMapping[str, str]]
 
 
-def _coerce_cart_int(value: Any) -> Any:
-    """Cart API expects integer ids; JSON may use str or float."""
-    if value is None or isinstance(value, bool):
-        return value
-    if isinstance(value, int):
-        return value
-    if isinstance(value, float) and value.is_integer():
-        return int(value)
-    try:
-        return int(str(value).strip(), 10)
-    except (TypeError, ValueError):
-        return value
-
-
-def _cart_terms_and_conditions(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> str:
-    for src in (tee_time_info, rate):
-        for key in (
-            "termsAndConditions",
-            "termsAndConditionsText",
-            "cancellationTerms",
-        ):
-            val = src.get(key)
-            if val:
-                return str(val)
-    return ""
-
-
-def _cart_teetime_notes(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> str:
-    for src in (tee_time_info, rate):
-        for key in (
-            "teetimeNotes",
-            "rateDescription",
-            "description",
-            "notes",
-            "longDescription",
-        ):
-            val = src.get(key)
-            if val:
-                return str(val)
-    return ""
-
-
-def _cart_product_lineups(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> List[Any]:
-    raw = tee_time_info.get("productLineups")
-    if raw is None:
-        raw = rate.get("productLineups")
-    if raw is None:
-        raw = tee_time_info.get("featuredProducts")
-    if raw is None:
-        raw = rate.get("featuredProducts")
-    return list(raw) if isinstance(raw, list) else []
+def create_client(recorder: Optional[Recorder] = None) -> httpx.AsyncClient:
+    """AsyncClient for the Kenna API; with ``recorder``, every exchange is recorded."""
+    if recorder is None:
+        return httpx.AsyncClient()
+    return httpx.AsyncClient(transport=RecordingTransport(recorder))
 
 
 def _redact_headers(headers: HeaderMap) -> Dict[str, str]:
@@ -87,88 +50,316 @@ def _log_rest_response(
     )
 
 
+# Lock/cart outcomes: booked, lost to someone else (move on), or worth a quick retry.
+SUCCESS = "success"
+CONTENDED = "contended"
+TRANSIENT = "transient"
+
+_TRANSIENT_STATUSES = frozenset({408, 425, 429})
+
+
+def classify_response(response: Optional[httpx.Response]) -> str:
+    """Classify a lock/cart response; ``None`` stands for a transport error."""
+    if response is None:
+        return TRANSIENT
+    if response.is_success:
+        return SUCCESS
+    if response.status_code in _TRANSIENT_STATUSES or response.status_code >= 500:
+        return TRANSIENT
+    # 409 and other 4xx: the slot is taken or the request will not succeed as sent.
+    return CONTENDED
+
+
+@dataclass(frozen=True)
+class TeeSheetPoll:
+    """Outcome of a conditional tee-sheet fetch (see :func:`poll_tee_times`)."""
+
+    changed: bool
+    etag: Optional[str]
+    digest: Optional[str]
+    tee_times: List[TeeTime]
+
+
+def _open_foursomes(payload: Any) -> List[TeeTime]:
+    """Unbooked foursomes as :class:`TeeTime`; new rates are indexed in the metadata store."""
+    store = get_metadata_store()
+    known = store.rates
+    out = []
+    for t in payload[0]["teetimes"]:
+        if t.get("bookedPlayers") != 0 or t.get("maxPlayers") != 4:
+            continue
+        rate = t["rates"][0]
+        rate_key = str(rate["_id"])
+        # A rate that cannot be parsed could not be carted either; skip the slot.
+        if rate_key not in known and not store.remember([t]):
+            continue
+        out.append(
+            TeeTime(
+                t["teetime"],
+                str(t.get("courseId", "")),
+                rate_key,
+                float(rate.get("greenFeeWalking") or 0) / 100.0,
+                tee_cart_fields(t),
+            )
+        )
+    return out
+
+
+class _SheetFlight:
+    """One in-flight tee-sheet request and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Task[Optional[List[TeeTime]]]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class _SheetFlights:
+    """Per event loop: in-flight tee-sheet requests and recently finished results."""
+
+    def __init__(self) -> None:
+        self.inflight: Dict[Tuple[str, str], _SheetFlight] = {}
+        # key -> (loop time the request finished, open foursomes or None on error)
+        self.recent: Dict[Tuple[str, str], Tuple[float, Optional[List[TeeTime]]]] = {}
+
+    def finished(self, key: Tuple[str, str], flight: _SheetFlight, now: float) -> None:
+        if self.inflight.get(key) is flight:
+            del self.inflight[key]
+        task = flight.task
+        if not task.cancelled() and task.exception() is None:
+            self.recent[key] = (now, task.result())
+
+
+# Futures belong to one loop; the simulator runs a fresh loop per morning.
+_SHEET_FLIGHTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SheetFlights]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
 async def get_tee_times(
+    client: httpx.AsyncClient,
+    course: str,
+    date: str,
+    logger: logging.Logger,
+    max_age: float = SHEET_SHARE_TTL,
+) -> Optional[List[TeeTime]]:
+    """Fetch tee times for a facility/date; unbooked foursome slots only.
+
+    Returns None if the request or its parsing failed (logged), so an error is not
+    mistaken for an empty sheet. Concurrent callers asking for the same sheet share
+    one request (single flight), and a result that finished at most ``max_age`` seconds
+    ago is reused. Each caller gets its own list to filter.
+    """
+    loop = asyncio.get_running_loop()
+    flights = _SHEET_FLIGHTS.get(loop)
+    if flights is None:
+        flights = _SHEET_FLIGHTS[loop] = _SheetFlights()
+    key = (str(course), date)
+    recent = flights.recent.get(key)
+    if recent is not None and loop.time() - recent[0] <= max_age:
+        return None if recent[1] is None else list(recent[1])
+
+    flight = flights.inflight.get(key)
+    if flight is None:
+        flight = _SheetFlight(loop.create_task(_fetch_tee_times(client, course, date, logger)))
+        flights.inflight[key] = flight
+        flight.task.add_done_callback(lambda _task, f=flight: flights.finished(key, f, loop.time()))
+    flight.waiters += 1
+    try:
+        # Shielded: one caller being cancelled must not fail the others' request.
+        tee_times = await asyncio.shield(flight.task)
+        return None if tee_times is None else list(tee_times)
+    finally:
+        flight.waiters -= 1
+        if flight.waiters == 0 and not flight.task.done():
+            if flights.inflight.get(key) is flight:
+                del flights.inflight[key]
+            flight.task.cancel()
+
+
+async def _fetch_tee_times(
     client: httpx.AsyncClient, course: str, date: str, logger: logging.Logger
-) -> List[Dict[str, Any]]:
-    """Fetch tee times for a facility/date; unbooked foursome slots only."""
+) -> Optional[List[TeeTime]]:
     url = ENDPOINTS["tee_time"].format(date, course)
     response = None
     try:
-        response = await client.get(url, headers=HEADERS, timeout=30.0)
+        response = await client.get(url, headers=HEADERS, timeout=request_timeout("poll"))
         response.raise_for_status()
-        payload = response.json()
-        tee_times = payload[0]["teetimes"]
-        filtered = [
-            t for t in tee_times if t.get("bookedPlayers") == 0 and t.get("maxPlayers") == 4
-        ]
-        return filtered
-    except (httpx.RequestError, httpx.HTTPStatusError, KeyError, IndexError, TypeError) as exc:
-        logger.info("========== get_tee_times error ==========")
+        return _open_foursomes(loads(response.content))
+    except (
+        httpx.RequestError,
+        httpx.HTTPStatusError,
+        KeyError,
+        IndexError,
+        TypeError,
+        ValueError,
+    ) as exc:
         if response is not None:
-            logger.info("status=%s", response.status_code)
             text = getattr(response, "text", "")
-            logger.info("body=%s", text[:2000])
-            with contextlib.suppress(ValueError):
-                logger.info("json=%s", response.json())
+            logger.info(
+                "get_tee_times error: status=%s body=%s",
+                response.status_code,
+                text[:2000],
+                extra=sampled("get_tee_times_error"),
+            )
         else:
-            logger.info("no response: %s", exc)
-        logger.info("========== get_tee_times error ==========")
-        return []
+            logger.info(
+                "get_tee_times error: no response: %s",
+                exc,
+                extra=sampled("get_tee_times_error"),
+            )
+        return None
+
+
+async def poll_tee_times(
+    client: httpx.AsyncClient,
+    course: str,
+    date: str,
+    logger: logging.Logger,
+    etag: Optional[str] = None,
+    digest: Optional[str] = None,
+) -> TeeSheetPoll:
+    """Cheap re-poll of a tee sheet: ``If-None-Match`` when an ETag is known, else a body hash.
+
+    An unchanged sheet (HTTP 304 or identical body digest) is reported without decoding
+    JSON; errors are logged and reported as unchanged so watchers keep their last state.
+    """
+    url = ENDPOINTS["tee_time"].format(date, course)
+    headers = {**HEADERS, "If-None-Match": etag} if etag else HEADERS
+    unchanged = TeeSheetPoll(False, etag, digest, [])
+    try:
+        response = await client.get(url, headers=headers, timeout=request_timeout("poll"))
+        if response.status_code == 304:
+            return unchanged
+        response.raise_for_status()
+        body_digest = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        new_etag = response.headers.get("ETag")
+        if body_digest == digest:
+            return TeeSheetPoll(False, new_etag or etag, digest, [])
+        return TeeSheetPoll(True, new_etag, body_digest, _open_foursomes(loads(response.content)))
+    except (
+        httpx.RequestError,
+        httpx.HTTPStatusError,
+        KeyError,
+        IndexError,
+        TypeError,
+        ValueError,
+    ) as exc:
+        logger.info(
+            "poll_tee_times error: course=%s date=%s %s",
+            course,
+            date,
+            exc,
+            extra=sampled("poll_tee_times_error"),
+        )
+        return unchanged
+
+
+_JSON_HEADERS = {**HEADERS, "Content-Type": "application/json"}
+_SLOT = BodyTemplate.slot
+# Pre-serialized bodies; keys include fetched_at so refreshed metadata rebuilds them.
+_CART_TEMPLATES: Dict[Tuple[str, float], BodyTemplate] = {}
+# The lock always asks for the whole foursome, whatever the rate allows.
+_LOCK_TEMPLATE = BodyTemplate(
+    {"teetime": _SLOT("teetime"), "slots": LOCK_SLOTS, "expiresIn": LOCK_EXPIRES_IN}, ("teetime",)
+)
+
+
+_CART_FIELDS = (
+    "teetime",
+    "price",
+    "is_pnas",
+    "rate_price",
+    "product_lineups",
+    "terms",
+    "notes",
+)
+
+
+def cart_body_template(meta: RateMeta) -> BodyTemplate:
+    """Cart body for ``meta``; the tee time and its own cart fields are left open."""
+    key = (str(meta.rate_id), meta.fetched_at)
+    template = _CART_TEMPLATES.get(key)
+    if template is None:
+        body = {
+            "item": {
+                "facilityId": meta.facility_id,
+                "type": "TeeTime",
+                "extra": {
+                    "teetime": _SLOT("teetime"),
+                    "players": meta.players,
+                    "groupSize": 1,
+                    "price": _SLOT("price"),
+                    "isPnasSelected": _SLOT("is_pnas"),
+                    "rate": {
+                        "holes": meta.holes,
+                        "price": _SLOT("rate_price"),
+                        "rateId": meta.rate_id,
+                        "rateSetId": meta.rate_set_id,
+                        "name": meta.name,
+                        "transactionFees": 0,
+                        "transportation": meta.transportation,
+                        "isSimulator": meta.is_simulator,
+                    },
+                    "productLineups": _SLOT("product_lineups"),
+                    "termsAndConditions": _SLOT("terms"),
+                    "teetimeNotes": _SLOT("notes"),
+                },
+            }
+        }
+        template = _CART_TEMPLATES[key] = BodyTemplate(body, _CART_FIELDS)
+    return template
+
+
+def warm_body_templates(metas: Iterable[RateMeta]) -> int:
+    """Build cart templates ahead of time; return how many rates were prepared."""
+    count = 0
+    for meta in metas:
+        cart_body_template(meta)
+        count += 1
+    return count
+
+
+def build_cart_body(tee_time: TeeTime) -> bytes:
+    """Serialized cart body for a tee time (template render on the hot path)."""
+    store = get_metadata_store()
+    meta = store.rate_for(tee_time)
+    return cart_body_template(meta).render(
+        teetime=tee_time.teetime,
+        price=tee_time.price,
+        rate_price=tee_time.price,
+        **store.cart_fields(tee_time, meta),
+    )
+
+
+def build_lock_body(tee_time: TeeTime) -> bytes:
+    """Serialized lock body for a tee time."""
+    return _LOCK_TEMPLATE.render(teetime=tee_time.teetime)
 
 
 async def set_shopping_cart(
     client: httpx.AsyncClient,
     cart_session: str,
-    tee_time_info: Dict[str, Any],
+    tee_time: TeeTime,
     logger: logging.Logger,
 ) -> httpx.Response:
     """POST selected tee time into the shopping cart."""
-    rate = tee_time_info["rates"][0]
-    gn = rate["golfnow"]
-    price = float(rate["greenFeeWalking"]) / 100.0
-    players = int(rate["allowedPlayers"][-1])
-    facility_id = _coerce_cart_int(gn["GolfFacilityId"])
-    rate_id = _coerce_cart_int(rate["_id"])
-    rate_set_id = _coerce_cart_int(gn["GolfCourseId"])
-    transportation = str(rate.get("transportation") or rate.get("name") or "Walking")
-    is_pnas = bool(tee_time_info.get("isPnasSelected", rate.get("isPnasSelected", False)))
-    data = {
-        "item": {
-            "facilityId": facility_id,
-            "type": "TeeTime",
-            "extra": {
-                "teetime": tee_time_info["teetime"],
-                "players": players,
-                "groupSize": 1,
-                "price": price,
-                "isPnasSelected": is_pnas,
-                "rate": {
-                    "holes": int(rate["holes"]),
-                    "price": price,
-                    "rateId": rate_id,
-                    "rateSetId": rate_set_id,
-                    "name": rate["name"],
-                    "transactionFees": 0,
-                    "transportation": transportation,
-                    "isSimulator": bool(rate["isSimulator"]),
-                },
-                "productLineups": _cart_product_lineups(tee_time_info, rate),
-                "termsAndConditions": _cart_terms_and_conditions(tee_time_info, rate),
-                "teetimeNotes": _cart_teetime_notes(tee_time_info, rate),
-            },
-        }
-    }
+    body = build_cart_body(tee_time)
     url = ENDPOINTS["cart_item"].format(cart_session)
+    meta = get_metadata_store().rate_for(tee_time)
     logger.info(
         "[REST] cart_item => POST teetime=%s facilityId=%s rateId=%s players=%s price=%s",
-        tee_time_info.get("teetime"),
-        data["item"]["facilityId"],
-        data["item"]["extra"]["rate"]["rateId"],
-        data["item"]["extra"]["players"],
-        data["item"]["extra"]["price"],
+        tee_time.teetime,
+        meta.facility_id,
+        meta.rate_id,
+        meta.players,
+        tee_time.price,
     )
 
-    response = await client.post(url, headers=HEADERS, json=data, timeout=30.0)
+    response = await client.post(
+        url, headers=_JSON_HEADERS, content=body, timeout=request_timeout("cart")
+    )
     _log_rest_response(logger, "cart_item", response)
     return response
 
@@ -176,23 +367,42 @@ async def set_shopping_cart(
 async def set_lock_tee_time(
     client: httpx.AsyncClient,
     login_session: str,
-    tee_time_info: Dict[str, Any],
+    tee_time: TeeTime,
     logger: logging.Logger,
 ) -> httpx.Response:
     """Hold a tee time briefly via the lock API."""
-    data = {
-        "teetime": tee_time_info["teetime"],
-        "slots": 4,
-        "expiresIn": 5,
-    }
-    headers = {**HEADERS, "Session": login_session}
-    url = ENDPOINTS["lock"].format(tee_time_info["courseId"])
+    body = build_lock_body(tee_time)
+    headers = {**_JSON_HEADERS, "Session": login_session}
+    url = ENDPOINTS["lock"].format(tee_time.course_id)
     logger.info(
         "[REST] lock => PUT teetime=%s courseId=%s",
-        tee_time_info.get("teetime"),
-        tee_time_info.get("courseId"),
+        tee_time.teetime,
+        tee_time.course_id,
     )
 
-    response = await client.put(url, headers=headers, json=data, timeout=30.0)
+    response = await client.put(url, headers=headers, content=body, timeout=request_timeout("lock"))
     _log_rest_response(logger, "lock", response)
     return response
+
+
+async def release_tee_time_lock(
+    client: httpx.AsyncClient,
+    login_session: str,
+    tee_time: TeeTime,
+    logger: logging.Logger,
+) -> httpx.Response:
+    """Give a locked tee time back (DELETE on the lock endpoint)."""
+    body = build_lock_body(tee_time)
+    headers = {**_JSON_HEADERS, "Session": login_session}
+    url = ENDPOINTS["lock"].format(tee_time.course_id)
+    logger.info(
+        "[REST] unlock => DELETE teetime=%s courseId=%s",
+        tee_time.teetime,
+        tee_time.course_id,
+    )
+
+    response = await client.request(
+        "DELETE", url, headers=headers, content=body, timeout=request_timeout("lock")
+    )
+    _log_rest_response(logger, "unlock", response)
+    return response
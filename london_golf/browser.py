@@ -1,13 +1,14 @@
 """Playwright helpers: login, sessions, and checkout UI flow."""
 
 import asyncio
+import contextlib
 import logging
-from typing import Tuple
+from typing import Optional, Tuple
 
+from playwright.async_api import Browser, BrowserContext, Page, Playwright
 from playwright.async_api import Error as PlaywrightError
-from playwright.async_api import Page
 
-from london_golf.constants import ENDPOINTS
+from london_golf.constants import BROWSER_ATTACH_TIMEOUT, ENDPOINTS
 from london_golf.exceptions import (
     AuthenticationError,
     CartError,
@@ -17,6 +18,30 @@ from london_golf.exceptions import (
 logger = logging.getLogger("london_golf")
 
 
+async def open_browser(
+    playwright: Playwright, headless: bool, cdp_endpoint: Optional[str] = None
+) -> Browser:
+    """Attach to the browser at ``cdp_endpoint`` if given and reachable, else launch one.
+
+    An attached browser is only disconnected by ``Browser.close()``; it keeps running
+    for the next run (see :mod:`london_golf.browser_server`).
+    """
+    if cdp_endpoint:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(
+                cdp_endpoint, timeout=BROWSER_ATTACH_TIMEOUT * 1000
+            )
+            logger.info("Attached to browser at %s (%s)", cdp_endpoint, browser.version)
+            return browser
+        except PlaywrightError as exc:
+            logger.info(
+                "CDP attach to %s failed: %s. Launching a browser.",
+                cdp_endpoint,
+                str(exc).splitlines()[0],
+            )
+    return await playwright.chromium.launch(headless=headless)
+
+
 async def do_login_and_get_sessions(
     page: Page,
     login_url: str,
@@ -74,6 +99,17 @@ async def do_login_and_get_sessions(
     return login_session, cart_session
 
 
+async def _confirm_reservation(page: Page, tn: str) -> None:
+    logger.info("[%s] + reservation.: click checkbox", tn)
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+    await page.click("input[name='chb-nm']")
+
+    logger.info("[%s] + reservation.: click the reservation button", tn)
+    await page.click("[data-testid='make-your-reservation-btn']")
+
+    logger.info("[%s] + reservation.: completed.", tn)
+
+
 async def set_reservation(page: Page, task_name: str) -> None:
     """Checkout: cart, checkout, waiver checkbox, confirm reservation."""
     tn = task_name.strip()
@@ -87,14 +123,7 @@ async def set_reservation(page: Page, task_name: str) -> None:
         logger.info("[%s] + reservation.: click checkout button", tn)
         await page.click("[data-testid='shopping-cart-drawer-checkout-btn']")
 
-        logger.info("[%s] + reservation.: click checkbox", tn)
-        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.click("input[name='chb-nm']")
-
-        logger.info("[%s] + reservation.: click the reservation button", tn)
-        await page.click("[data-testid='make-your-reservation-btn']")
-
-        logger.info("[%s] + reservation.: completed.", tn)
+        await _confirm_reservation(page, tn)
     except PlaywrightError as exc:
         detail = f"Failed to complete reservation UI step. url={page.url}\nError: {exc}"
         raise ReservationError(detail) from exc
@@ -138,3 +167,76 @@ async def set_reservation_with_retry(page: Page, task_name: str, max_retries: in
                 raise ReservationError(
                     f"Failed to complete reservation after {max_retries} attempts: {exc}"
                 ) from exc
+
+
+class CheckoutPreloader:
+    """Load the checkout route in a second tab while the API search runs.
+
+    The tab shares the login context and warms the site's assets and connections. The
+    cart is still empty then, so the route may redirect; once a slot is carted,
+    :meth:`checkout` navigates the warm tab to the checkout route and confirms. If the
+    preload failed or the route is not usable, it falls back to the full
+    :func:`set_reservation_with_retry` flow.
+    """
+
+    def __init__(self, context: BrowserContext, task_name: str) -> None:
+        self._context = context
+        self._tn = task_name.strip()
+        self._page: Optional[Page] = None
+        self._loading: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._loading = asyncio.create_task(self._load(), name=f"checkout-preload-{self._tn}")
+
+    async def _load(self) -> bool:
+        try:
+            self._page = await self._context.new_page()
+            await self._page.goto(ENDPOINTS["checkout"], wait_until="domcontentloaded")
+            if ENDPOINTS["checkout"] in self._page.url:
+                logger.info(
+                    "[%s] + reservation.: checkout tab preloaded (%s)", self._tn, self._page.url
+                )
+            else:
+                logger.info(
+                    "[%s] + reservation.: checkout tab warmed; empty cart redirected to %s",
+                    self._tn,
+                    self._page.url,
+                )
+            return True
+        except PlaywrightError as exc:
+            logger.info("[%s] + reservation.: checkout preload failed: %s", self._tn, exc)
+            return False
+
+    async def _fast_checkout(self) -> bool:
+        if self._loading is None or not await self._loading or self._page is None:
+            return False
+        page = self._page
+        try:
+            # Navigate, not reload: with the cart empty the preload may have been redirected.
+            await page.goto(ENDPOINTS["checkout"], wait_until="domcontentloaded")
+            if ENDPOINTS["checkout"] not in page.url:
+                logger.info(
+                    "[%s] + reservation.: checkout tab redirected to %s", self._tn, page.url
+                )
+                return False
+            await page.bring_to_front()
+            await _confirm_reservation(page, self._tn)
+            return True
+        except PlaywrightError as exc:
+            logger.info("[%s] + reservation.: preloaded checkout failed: %s", self._tn, exc)
+            return False
+
+    async def checkout(self, fallback_page: Page, task_name: str) -> None:
+        """Confirm on the preloaded tab, or run the full flow on ``fallback_page``."""
+        if await self._fast_checkout():
+            return
+        await set_reservation_with_retry(fallback_page, task_name)
+
+    async def close(self) -> None:
+        if self._loading is not None and not self._loading.done():
+            self._loading.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._loading
+        if self._page is not None:
+            with contextlib.suppress(PlaywrightError):
+                await self._page.close()
@@ -0,0 +1,137 @@
+"""Long-lived Chromium for ``--cdp-endpoint``: start it, keep it up, restart it if it dies.
+
+    python -m london_golf.browser_server --headless            # CDP on 127.0.0.1:9222
+
+Runs then attach with ``--cdp-endpoint http://127.0.0.1:9222`` (or
+``LONDON_GOLF_CDP_ENDPOINT``) and only open a fresh context each, instead of paying
+for a cold browser start. The browser is Playwright's own Chromium build, so it
+matches the protocol version the runs speak.
+"""
+
+import argparse
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+from playwright.sync_api import sync_playwright
+
+from london_golf.constants import (
+    BROWSER_CDP_PORT,
+    BROWSER_MAX_FAILED_STARTS,
+    BROWSER_RESTART_DELAY,
+    BROWSER_START_TIMEOUT,
+)
+from london_golf.logging_config import get_logger
+
+
+def _say(message: str) -> None:
+    print(message, flush=True)
+    get_logger().info("%s", message)
+
+
+def chromium_executable() -> str:
+    """Path of the Chromium that ``playwright install chromium`` put in place."""
+    with sync_playwright() as playwright:
+        return playwright.chromium.executable_path
+
+
+def chromium_args(port: int, user_data_dir: Path, headless: bool) -> List[str]:
+    args = [
+        f"--remote-debugging-port={port}",
+        "--remote-debugging-address=127.0.0.1",
+        f"--user-data-dir={user_data_dir}",
+        "--no-first-run",
+        "--no-default-browser-check",
+    ]
+    if headless:
+        args.append("--headless=new")
+    return args
+
+
+def wait_until_ready(port: int, proc: subprocess.Popen, timeout: float) -> Optional[str]:
+    """Poll ``/json/version`` until the endpoint answers; its WebSocket URL, or None."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and proc.poll() is None:
+        try:
+            response = httpx.get(f"http://127.0.0.1:{port}/json/version", timeout=1.0)
+            if response.is_success:
+                return response.json().get("webSocketDebuggerUrl", "")
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    return None
+
+
+def _stop(proc: subprocess.Popen) -> None:
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def serve(port: int, headless: bool, user_data_dir: Path, executable: str) -> int:
+    """Keep one Chromium listening on ``port``; return the exit status for the command."""
+    failed_starts = 0
+    restarts = 0
+    while True:
+        proc = subprocess.Popen(
+            [executable, *chromium_args(port, user_data_dir, headless)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        try:
+            ws_url = wait_until_ready(port, proc, BROWSER_START_TIMEOUT)
+            if ws_url is None:
+                failed_starts += 1
+                _say(f"[BROWSER] pid={proc.pid} not ready after {BROWSER_START_TIMEOUT:g}s")
+                _stop(proc)
+                if failed_starts >= BROWSER_MAX_FAILED_STARTS:
+                    _say(f"[BROWSER] giving up after {failed_starts} failed starts")
+                    return 1
+            else:
+                failed_starts = 0
+                _say(f"[BROWSER] ready pid={proc.pid} endpoint=http://127.0.0.1:{port} ({ws_url})")
+                code = proc.wait()
+                restarts += 1
+                _say(f"[BROWSER] pid={proc.pid} exited with {code}; restart {restarts}")
+        except (KeyboardInterrupt, SystemExit):
+            _stop(proc)
+            _say(f"[BROWSER] stopped pid={proc.pid}")
+            return 0
+        time.sleep(BROWSER_RESTART_DELAY)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a long-lived Chromium for --cdp-endpoint")
+    parser.add_argument("--port", type=int, default=BROWSER_CDP_PORT)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument(
+        "--user-data-dir",
+        type=Path,
+        default=None,
+        help="Browser profile directory (default: a temporary one, removed on exit)",
+    )
+    args = parser.parse_args()
+
+    # Service managers stop with SIGTERM; take Chromium down with us.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    user_data_dir = args.user_data_dir or Path(tempfile.mkdtemp(prefix="london-golf-chromium-"))
+    try:
+        status = serve(args.port, args.headless, user_data_dir, chromium_executable())
+    finally:
+        if args.user_data_dir is None:
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
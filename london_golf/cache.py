@@ -1,82 +1,161 @@
-"""Tee-time deduplication cache backed by Redis or a local JSON file."""
+"""Tee-time deduplication cache backed by Redis or a local JSON file.
+
+Searches share one :class:`CacheManager` per process (:func:`get_cache`). Nothing is
+connected or read up front: the Redis client connects on its first command and the
+local file is loaded on first use. Redis hits are kept in a short-lived in-memory
+front layer (``CACHE_FRONT_TTL``), so re-checking an already selected candidate on
+every poll does not cost a round trip. Misses are never kept: another process's
+``set`` must be visible on the very next lookup, or both would lock the same slot.
+If Redis fails, the cache falls back to the local store for the rest of the process.
+"""
 
 import json
 import logging
 import os
-from typing import Any, Dict, Optional
+import time
+from typing import Any, Dict, Optional, Tuple
 
 import redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
 
-from london_golf.constants import LOCAL_CACHE_FILE
+from london_golf.config_loader import AppConfig
+from london_golf.constants import CACHE_FRONT_TTL, CACHE_REDIS_TIMEOUT, LOCAL_CACHE_FILE
 
 
 class CacheManager:
-    """Deduplicate tee times: Redis if configured, else local JSON."""
+    """Deduplicate tee times: Redis if configured, else local JSON.
+
+    ``cache_file=None`` keeps the local cache in memory only (replays, simulations).
+    """
 
-    def __init__(self, config: Dict[str, Any], logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        logger: logging.Logger,
+        cache_file: Optional[str] = LOCAL_CACHE_FILE,
+        front_ttl: float = CACHE_FRONT_TTL,
+    ) -> None:
         self._logger = logger
         self.use_redis = False
-        self.redis_connection = None
-        self.cache_file = LOCAL_CACHE_FILE
-        self.cache_data: Dict[str, Any] = {}
+        self.redis_connection: Optional[redis.Redis] = None
+        self.cache_file = cache_file
+        self._cache_data: Optional[Dict[str, Any]] = None
+        self._front_ttl = front_ttl
+        # key -> (value, monotonic expiry); hits only
+        self._front: Dict[str, Tuple[str, float]] = {}
 
         redis_cfg = config.get("redis") or {}
         if isinstance(redis_cfg, dict) and "host" in redis_cfg and "port" in redis_cfg:
             try:
+                # redis-py connects on the first command; no ping here.
                 self.redis_connection = redis.Redis(
                     host=redis_cfg["host"],
                     port=redis_cfg["port"],
                     decode_responses=True,
+                    socket_connect_timeout=CACHE_REDIS_TIMEOUT,
+                    socket_timeout=CACHE_REDIS_TIMEOUT,
+                    # Fail over to the local store at once instead of backing off.
+                    retry=Retry(NoBackoff(), 0),
                 )
-                self.redis_connection.ping()
                 self.use_redis = True
-                self._logger.info("Using Redis for caching")
-            except (redis.exceptions.RedisError, OSError, ValueError) as exc:
-                self._logger.info(
-                    "Redis connection failed: %s. Using local file cache instead.",
-                    exc,
-                )
-                self.use_redis = False
+            except (redis.exceptions.RedisError, ValueError) as exc:
+                self._logger.info("Redis config rejected: %s. Using local file cache.", exc)
 
-        if not self.use_redis and os.path.exists(self.cache_file):
-            try:
-                with open(self.cache_file, encoding="utf-8") as file_handle:
-                    self.cache_data = json.load(file_handle)
-                self._logger.info("Loaded local cache from %s", self.cache_file)
-            except (OSError, json.JSONDecodeError, TypeError) as exc:
-                self._logger.info(
-                    "Failed to load local cache: %s. Starting with empty cache.",
-                    exc,
-                )
-                self.cache_data = {}
+    @property
+    def cache_data(self) -> Dict[str, Any]:
+        """The local store, loaded from ``cache_file`` on first access."""
+        if self._cache_data is None:
+            self._cache_data = self._load_local()
+        return self._cache_data
+
+    def _load_local(self) -> Dict[str, Any]:
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        try:
+            with open(self.cache_file, encoding="utf-8") as file_handle:
+                data = json.load(file_handle)
+            self._logger.info("Loaded local cache from %s", self.cache_file)
+            return data
+        except (OSError, json.JSONDecodeError, TypeError) as exc:
+            self._logger.info("Failed to load local cache: %s. Starting with empty cache.", exc)
+            return {}
+
+    def _save_local(self) -> None:
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, "w", encoding="utf-8") as file_handle:
+                json.dump(self.cache_data, file_handle)
+        except (OSError, TypeError) as exc:
+            self._logger.info("Failed to save local cache: %s", exc)
+
+    def _redis_failed(self, exc: Exception) -> None:
+        self._logger.info("Redis connection failed: %s. Using local file cache instead.", exc)
+        self.use_redis = False
+        self._front.clear()
+
+    def _remember(self, key: str, value: str, ttl: float) -> None:
+        self._front[key] = (value, time.monotonic() + min(ttl, self._front_ttl))
 
     def get(self, key: str) -> Optional[str]:
         """Return cached string value or None."""
         if self.use_redis:
-            return self.redis_connection.get(key)
-        return self.cache_data.get(key)
+            entry = self._front.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return entry[0]
+            try:
+                value = self.redis_connection.get(key)
+            except (redis.exceptions.RedisError, OSError) as exc:
+                self._redis_failed(exc)
+            else:
+                if value is not None:
+                    self._remember(key, value, self._front_ttl)
+                return value
+        data = self._cache_data
+        if data is None:
+            data = self.cache_data
+        return data.get(key)
 
     def set(self, key: str, value: str, expire_seconds: int = 300) -> None:
         """Store value; Redis TTL or persist JSON for file cache."""
         if self.use_redis:
-            self.redis_connection.set(key, value)
-            self.redis_connection.expire(key, expire_seconds)
-        else:
-            self.cache_data[key] = value
             try:
-                with open(self.cache_file, "w", encoding="utf-8") as file_handle:
-                    json.dump(self.cache_data, file_handle)
-            except (OSError, TypeError) as exc:
-                self._logger.info("Failed to save local cache: %s", exc)
+                self.redis_connection.set(key, value, ex=expire_seconds)
+            except (redis.exceptions.RedisError, OSError) as exc:
+                self._redis_failed(exc)
+            else:
+                self._remember(key, value, expire_seconds)
+                return
+        data = self._cache_data
+        if data is None:
+            data = self.cache_data
+        data[key] = value
+        if self.cache_file:
+            self._save_local()
 
     def delete(self, key: str) -> None:
         """Remove a key from cache."""
         if self.use_redis:
-            self.redis_connection.delete(key)
-        elif key in self.cache_data:
-            del self.cache_data[key]
+            self._front.pop(key, None)
             try:
-                with open(self.cache_file, "w", encoding="utf-8") as file_handle:
-                    json.dump(self.cache_data, file_handle)
-            except (OSError, TypeError) as exc:
-                self._logger.info("Failed to save local cache: %s", exc)
+                self.redis_connection.delete(key)
+                return
+            except (redis.exceptions.RedisError, OSError) as exc:
+                self._redis_failed(exc)
+        if key in self.cache_data:
+            del self.cache_data[key]
+            self._save_local()
+
+
+class _CacheState:  # pylint: disable=too-few-public-methods
+    """Process-local cache shared by every search."""
+
+    cache: Optional[CacheManager] = None
+
+
+def get_cache(config: AppConfig, logger: logging.Logger) -> CacheManager:
+    """Return the process-wide cache, creating it from ``config.redis`` on first use."""
+    if _CacheState.cache is None:
+        _CacheState.cache = CacheManager(config.model_dump(include={"redis"}), logger)
+    return _CacheState.cache
@@ -1,31 +1,33 @@
-"""CLI: parse args, login, run schedules, finalize reservation (Async)."""
+"""CLI: parse args, then hand off to the task runner, supervisor or preflight.
+
+Only the standard library and constants are imported at module load. The booking
+stack (Playwright, httpx, redis, pydantic) is imported on the path that needs it,
+so ``--help``, argument errors and ``--preflight`` start quickly.
+"""
 
 import argparse
 import asyncio
-import datetime as dt
-import logging
+import os
 import sys
-import traceback
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Optional
+
+from london_golf.constants import (
+    AFTER_FIRST_BOOKING,
+    AFTER_FIRST_POLICIES,
+    CHECKOUT_DEADLINE,
+    HOLD_DEADLINE,
+    RUN_DEADLINE,
+    SEARCH_DEADLINE,
+)
 
-import httpx
-from playwright.async_api import async_playwright
+if TYPE_CHECKING:
+    from london_golf.config_loader import AppConfig
+    from london_golf.supervisor import TaskResult
 
-from london_golf.browser import (
-    do_login_and_get_sessions,
-    set_reservation_with_retry,
-)
-from london_golf.config_loader import (
-    AppConfig,
-    get_task_credentials,
-    get_task_schedule_entries,
-    load_config,
-    resolve_default_config_path,
-)
-from london_golf.constants import BOOK_INTERVAL, ENDPOINTS, TIMEOUT, WEEKDAY
-from london_golf.exceptions import ConfigError
-from london_golf.logging_config import get_logger
-from london_golf.schedule import get_book_schedule
+# Heavy subsystems are imported inside the functions below on purpose.
+# pylint: disable=import-outside-toplevel
 
 
 def _build_argument_parser() -> argparse.ArgumentParser:
@@ -35,7 +37,8 @@ def _build_argument_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "task",
-        help="Schedule task name (e.g. pro_song)",
+        nargs="+",
+        help="Schedule task name(s) (e.g. pro_song); several tasks run concurrently",
     )
     parser.add_argument(
         "--headless",
@@ -59,137 +62,150 @@ def _build_argument_parser() -> argparse.ArgumentParser:
         type=int,
         default=None,
         metavar="N",
-        help="Ignored in asyncio mode (all tasks run concurrently)",
+        help="Run several tasks in up to N worker processes (tasks sharing an account stay together)",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="Record every API request/response with timing to PATH (gzip JSON lines)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=SEARCH_DEADLINE,
+        metavar="SECONDS",
+        help=f"Stop the schedule search after SECONDS (default {SEARCH_DEADLINE:g})",
+    )
+    parser.add_argument(
+        "--run-deadline",
+        type=float,
+        default=RUN_DEADLINE,
+        metavar="SECONDS",
+        help=f"End-to-end budget for search, hold and checkout (default {RUN_DEADLINE:g})",
+    )
+    parser.add_argument(
+        "--after-first",
+        choices=AFTER_FIRST_POLICIES,
+        default=AFTER_FIRST_BOOKING,
+        help="After the first booking, stop the other schedule rows or let them continue",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=Path("profiles"),
+        default=None,
+        metavar="DIR",
+        help="Write a cProfile dump per phase to DIR (default ./profiles) and log loop stalls",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        default=None,
+        metavar="HOURS",
+        help="Watch upcoming dates for cancellations for HOURS instead of the release-window search",
+    )
+    parser.add_argument(
+        "--cdp-endpoint",
+        default=os.environ.get("LONDON_GOLF_CDP_ENDPOINT"),
+        metavar="URL",
+        help="Attach to a running Chromium (http:// or ws:// CDP endpoint) instead of launching one",
+    )
+    parser.add_argument(
+        "--preflight",
+        action="store_true",
+        help="Validate config and tasks, resolve the caches and warm the API without a browser",
     )
     return parser
 
 
-def _load_config_or_exit(config_path: Path) -> AppConfig:
+def _load_config_or_exit(config_path: Optional[Path]) -> "AppConfig":
+    from london_golf.config_loader import load_config, resolve_default_config_path
+    from london_golf.exceptions import ConfigError
+
     try:
-        return load_config(config_path)
+        return load_config(config_path or resolve_default_config_path())
     except ConfigError as exc:
         print(f"[ERROR] {exc}", file=sys.stderr)
+        sys.exit(1)
 
 
-def _log_phase_banner(logger: logging.Logger, task_name: str, *, start: bool) -> None:
-    label = "START" if start else "END"
-    logger.info(
-        "[%s] -------------------------------- %s --------------------------------",
-        task_name,
-        label,
-    )
-
-
-def _log_traceback(logger: logging.Logger, traceback_msg: str) -> None:
-    sep = "[ERROR]" + "-" * 100
-    logger.info("%s", sep)
-    logger.info("%s", traceback_msg)
-    logger.info("%s", sep)
-    print(sep, file=sys.stderr)
-    print(traceback_msg, file=sys.stderr)
-    print(sep, file=sys.stderr)
-
-
-async def _run_schedules_async(
-    client: httpx.AsyncClient,
-    config: AppConfig,
-    task_name: str,
-    tasks_dict: dict,
-    cart_session: str,
-    login_session: str,
-    logger: logging.Logger,
-) -> bool:
-    found = False
-
-    target_date = dt.datetime.now() + dt.timedelta(days=BOOK_INTERVAL)
-    default_target = WEEKDAY[target_date.weekday()]
-
-    logger.info(
-        "[%s] Target booking date: %s (%s)",
-        task_name,
-        target_date.strftime("%Y-%m-%d"),
-        default_target,
-    )
-
-    for weekday, schedule_info in tasks_dict.items():
-        # If no explicit book_date override, only execute the default target weekday
-        if not schedule_info.book_date and weekday != default_target:
-            continue
-
-        result = await get_book_schedule(
-            client, schedule_info, task_name, cart_session, login_session, config, weekday
+async def run_tasks(
+    args: argparse.Namespace,
+    task_names: List[str],
+    worker: int = 0,
+    on_result: Optional[Callable[["TaskResult"], None]] = None,
+    on_stage: Optional[Callable[[str, str], None]] = None,
+) -> List["TaskResult"]:
+    """Run several tasks concurrently in this process (one browser each).
+
+    ``on_result`` gets each task's result as soon as that task finishes; ``on_stage``
+    is passed on to :func:`london_golf.runner.run_task`.
+    """
+    from london_golf.runner import run_task
+    from london_golf.supervisor import TaskResult
+
+    config = _load_config_or_exit(args.config)
+    if args.profile and len(task_names) > 1:
+        # cProfile allows one active profiler per thread (3.12+ raises, older versions
+        # silently replace it), and concurrent tasks' phases overlap on the loop thread.
+        print(
+            f"[WARN] --profile needs one task per process; not profiling "
+            f"{', '.join(task_names)} (use --workers {len(args.task)} to profile each task)",
+            file=sys.stderr,
         )
-        if result:
-            found = True
-            break
-    return found
-
+        args = argparse.Namespace(**{**vars(args), "profile": None})
 
-async def async_main() -> None:
-    logger = get_logger()
-    args = _build_argument_parser().parse_args()
-    cfg_path = args.config or resolve_default_config_path()
-    config = _load_config_or_exit(cfg_path)
-    task_name = args.task
-    _log_phase_banner(logger, task_name, start=True)
-
-    logger.info("[%s] Initializing... Headless: %s", task_name, args.headless)
-    login_uid, login_pwd = get_task_credentials(config, task_name)
+    async def _one(name: str) -> "TaskResult":
+        started = time.monotonic()
+        found, error = False, None
+        try:
+            found = await run_task(args, config, name, on_stage=on_stage)
+        except Exception as exc:  # pylint: disable=broad-except
+            error = repr(exc)
+        result = TaskResult(name, found, time.monotonic() - started, worker, os.getpid(), error)
+        if on_result is not None:
+            on_result(result)
+        return result
 
-    is_headless = args.headless
+    return list(await asyncio.gather(*(_one(name) for name in task_names)))
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=is_headless)
-        context = await browser.new_context()
-        page = await context.new_page()
 
-        try:
-            logger.info("[%s] Authenticating as %s...", task_name, login_uid)
-            login_session, cart_session = await do_login_and_get_sessions(
-                page, ENDPOINTS["login"], login_uid, login_pwd
-            )
-            logger.info(
-                "[%s] Acquired login session: %s...%s",
-                task_name,
-                login_session[:10],
-                login_session[-10:],
-            )
-            logger.info("[%s] Acquired cart session: %s", task_name, cart_session)
-
-            tasks_dict = get_task_schedule_entries(config, task_name)
-            logger.info("[%s] Loaded %s scheduled tasks", task_name, len(tasks_dict))
-
-            async with httpx.AsyncClient() as client:
-                found = await _run_schedules_async(
-                    client, config, task_name, tasks_dict, cart_session, login_session, logger
-                )
-
-            if found:
-                if not args.dry_run:
-                    logger.info("[%s] Executing checkout sequence...", task_name)
-                    await set_reservation_with_retry(page, task_name)
-                    logger.info("[%s] Checkout sequence completed successfully.", task_name)
-                    await asyncio.sleep(TIMEOUT)
-                else:
-                    logger.info("[%s] --dry-run active. Skipping actual checkout.", task_name)
-            else:
-                logger.info("[%s] No tee times locked. Skipping checkout.", task_name)
-
-        except Exception:
-            traceback_msg = f"Traceback: {traceback.format_exc()}"
-            _log_traceback(logger, traceback_msg)
-        finally:
-            await context.close()
-            await browser.close()
-            logger.info("[%s] Session closed.", task_name)
-            _log_phase_banner(logger, task_name, start=False)
+async def async_main(args: Optional[argparse.Namespace] = None) -> List["TaskResult"]:
+    args = args or _build_argument_parser().parse_args()
+    return await run_tasks(args, args.task)
 
 
 def main() -> None:
+    parser = _build_argument_parser()
+    args = parser.parse_args()
+    reserved = HOLD_DEADLINE + CHECKOUT_DEADLINE
+    if args.watch is None and args.run_deadline <= reserved:
+        # --watch sizes its own run budget; otherwise the search would get no time at all.
+        parser.error(
+            f"--run-deadline must exceed {reserved:g}s "
+            f"(HOLD_DEADLINE {HOLD_DEADLINE:g}s + CHECKOUT_DEADLINE {CHECKOUT_DEADLINE:g}s)"
+        )
     try:
-        asyncio.run(async_main())
+        if args.preflight:
+            from london_golf.preflight import run_preflight
+
+            config = _load_config_or_exit(args.config)
+            ok = asyncio.run(run_preflight(config, args.task, args.cdp_endpoint))
+            sys.exit(0 if ok else 1)
+        if args.workers and args.workers > 1 and len(args.task) > 1:
+            from london_golf.supervisor import run_supervisor
+
+            config = _load_config_or_exit(args.config)
+            results = run_supervisor(args, config, args.task, args.workers)
+        else:
+            results = asyncio.run(async_main(args))
     except KeyboardInterrupt:
         sys.exit(1)
+    if any(r.error for r in results):
+        sys.exit(1)
 
 
 if __name__ == "__main__":
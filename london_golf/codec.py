@@ -0,0 +1,75 @@
+"""JSON codec for the booking hot path: orjson when installed, stdlib json otherwise.
+
+:class:`BodyTemplate` pre-serializes a request body once with placeholder fields, so
+rendering it for a chosen tee time is a few byte joins instead of a full encode.
+"""
+
+import json
+from typing import Any, Dict, List, Sequence
+
+try:  # Optional speedup: pip install "london-golf[fast]"
+    import orjson
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize ``obj`` to compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class BodyTemplate:
+    """A JSON body serialized once, with named fields left open for :meth:`render`.
+
+    Build it from a structure whose open fields hold :meth:`slot` markers; the markers
+    are cut out of the encoded bytes, leaving fixed chunks to join around the values.
+    """
+
+    __slots__ = ("fields", "_chunks")
+
+    _MARK = "\u0000tpl:{}\u0000"
+
+    def __init__(self, body: Dict[str, Any], fields: Sequence[str]) -> None:
+        self.fields = tuple(fields)
+        encoded = dumps(body)
+        chunks: List[bytes] = []
+        order = []
+        for name in self.fields:
+            marker = dumps(self.slot(name))
+            if encoded.count(marker) != 1:
+                raise ValueError(f"template field {name!r} must appear exactly once")
+            order.append((encoded.index(marker), name, marker))
+        pos = 0
+        ordered_fields = []
+        for idx, name, marker in sorted(order):
+            chunks.append(encoded[pos:idx])
+            ordered_fields.append(name)
+            pos = idx + len(marker)
+        chunks.append(encoded[pos:])
+        self.fields = tuple(ordered_fields)
+        self._chunks = tuple(chunks)
+
+    @classmethod
+    def slot(cls, name: str) -> str:
+        """Marker to place where field ``name`` goes in the template body."""
+        return cls._MARK.format(name)
+
+    def render(self, **values: Any) -> bytes:
+        """Return the body bytes with each open field encoded from ``values``."""
+        chunks = self._chunks
+        out = [chunks[0]]
+        for i, name in enumerate(self.fields, start=1):
+            out.append(dumps(values[name]))
+            out.append(chunks[i])
+        return b"".join(out)
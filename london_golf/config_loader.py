@@ -1,12 +1,13 @@
 """Load YAML configuration and resolve default config path using Pydantic."""
 
+import datetime as dt
 import os
 import sys
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import yaml
-from pydantic import BaseModel, ValidationError, model_validator
+from pydantic import BaseModel, ValidationError, field_validator, model_validator
 
 from london_golf.exceptions import ConfigError
 
@@ -26,14 +27,41 @@ class RedisConfig(BaseModel):
     port: int
 
 
+def _expand_book_dates(value: Any) -> Optional[List[str]]:
+    """Normalize ``book_date``: one date, a list of dates, or an inclusive ``A..B`` range."""
+    if value is None or value == "" or value == []:
+        return None
+    items = value if isinstance(value, list) else [value]
+    dates: List[str] = []
+    for item in items:
+        if isinstance(item, dt.date):
+            dates.append(item.strftime("%Y-%m-%d"))
+            continue
+        text = str(item).strip()
+        if ".." in text:
+            first, last = (dt.date.fromisoformat(part.strip()) for part in text.split("..", 1))
+            if last < first:
+                raise ValueError(f"book_date range ends before it starts: {text}")
+            for offset in range((last - first).days + 1):
+                dates.append((first + dt.timedelta(days=offset)).strftime("%Y-%m-%d"))
+        else:
+            dates.append(dt.date.fromisoformat(text).strftime("%Y-%m-%d"))
+    return list(dict.fromkeys(dates))
+
+
 class TaskScheduleRow(BaseModel):
-    book_date: Optional[str] = None
+    book_date: Optional[List[str]] = None
     book_count: int = 1
     start_time: str
     duration: int = 30
     slot: int = 0
     course: Union[str, List[str]]
 
+    @field_validator("book_date", mode="before")
+    @classmethod
+    def expand_book_date(cls, value: Any) -> Optional[List[str]]:
+        return _expand_book_dates(value)
+
 
 class ScheduleTaskConfig(BaseModel):
     auth: Optional[str] = None
@@ -103,16 +131,30 @@ def get_task_schedule_entries(config: AppConfig, task_name: str) -> Dict[str, Ta
     return block.weekdays
 
 
-def get_task_credentials(config: AppConfig, task_name: str) -> Tuple[str, str]:
-    """Return ``(userid, password)`` for ``task_name``."""
+def get_task_auth_key(config: AppConfig, task_name: str) -> str:
+    """Key under ``authentication`` that ``task_name`` logs in with (defaults to the task name)."""
     if task_name not in config.schedule:
         raise ConfigError(f"Unknown schedule task: {task_name}")
 
     block = config.schedule[task_name]
-    auth_key = block.auth if block.auth else task_name
+    return block.auth if block.auth else task_name
+
+
+def get_task_credentials(config: AppConfig, task_name: str) -> Tuple[str, str]:
+    """Return ``(userid, password)`` for ``task_name``."""
+    auth_key = get_task_auth_key(config, task_name)
 
     if auth_key not in config.authentication:
         raise ConfigError(f"Unknown authentication key: {auth_key}")
 
     creds = config.authentication[auth_key]
     return creds.userid, creds.password
+
+
+def get_task_facility_codes(config: AppConfig, tasks_dict: Dict[str, TaskScheduleRow]) -> List[str]:
+    """Facility codes of every course in ``tasks_dict``, in order, without duplicates."""
+    codes = []
+    for row in tasks_dict.values():
+        courses = [row.course] if isinstance(row.course, str) else row.course
+        codes.extend(str(config.course[c].code) for c in courses)
+    return list(dict.fromkeys(codes))
@@ -3,13 +3,53 @@
 TIMEOUT = 20
 BOOK_INTERVAL = 8
 MAX_WAIT_TEETIME = 100
+POLL_INTERVAL = 1.0
+SHEET_SHARE_TTL = 0.1
+MAX_CONCURRENT_SEARCHES = 4
+WORKER_MAX_RESTARTS = 2
+SEARCH_DEADLINE = 300.0
+RUN_DEADLINE = 600.0
+HOLD_DEADLINE = 30.0
+CHECKOUT_DEADLINE = 180.0
+HTTP_CONNECT_TIMEOUT = 3.0
+HTTP_READ_TIMEOUTS = {"poll": 5.0, "lock": 8.0, "cart": 10.0, "metadata": 30.0}
+AFTER_FIRST_POLICIES = ("stop", "continue")
+AFTER_FIRST_BOOKING = "stop"
+LOCK_SLOTS = 4
+LOCK_EXPIRES_IN = 5
+LOCK_REFRESH_INTERVAL = 2.0
+BOOK_RETRIES = 2
+BOOK_RETRY_BACKOFF = 0.15
+WATCH_MIN_INTERVAL = 5.0
+WATCH_MAX_INTERVAL = 120.0
+WATCH_BACKOFF = 1.5
+STREAM_BUFFER = 64
+LOOP_LAG_THRESHOLD = 0.1
+LOOP_LAG_INTERVAL = 0.02
+BROWSER_CDP_PORT = 9222
+BROWSER_ATTACH_TIMEOUT = 5.0
+BROWSER_START_TIMEOUT = 15.0
+BROWSER_RESTART_DELAY = 2.0
+BROWSER_MAX_FAILED_STARTS = 5
 WEEKDAY = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
 HEADERS = {"X-Be-Alias": "city-of-london-golf-courses"}
 LOCAL_CACHE_FILE = "tee_time_cache.json"
+CACHE_FRONT_TTL = 2.0
+CACHE_REDIS_TIMEOUT = 0.5
+METADATA_CACHE_FILE = "course_metadata_cache.json"
+METADATA_TTL = 6 * 3600
+HISTORY_DIR = "tee_sheet_history"
+RELEASE_MIN_SAMPLES = 4
+RELEASE_MAX_SPREAD = 30.0
+BURST_LEAD = 3.0
+BURST_SPAN = 20.0
+BURST_INTERVAL = 0.25
+PRE_BURST_INTERVAL = 5.0
 
 _KENNA = "https://phx-api-be-east-1b.kenna.io"
 ENDPOINTS = {
     "login": "https://city-of-london-golf-courses.book.teeitup.com/login",
+    "checkout": "https://city-of-london-golf-courses.book.teeitup.com/checkout",
     "course": f"{_KENNA}/course",
     "cart": f"{_KENNA}/shopping-cart/",
     "cart_item": f"{_KENNA}/shopping-cart/{{}}/cart-item",
@@ -0,0 +1,87 @@
+"""Run and phase deadlines, and the per-request HTTP timeouts derived from them.
+
+A :class:`Deadline` is an absolute expiry on the monotonic clock; :meth:`Deadline.child`
+narrows it for a phase (search, hold, checkout) without ever outliving its parent. The
+active deadline is kept in a context variable, so ``request_timeout`` can size every
+Kenna request from the time actually left instead of a flat 30 seconds.
+"""
+
+import contextlib
+import contextvars
+import time
+from typing import Iterator, Optional
+
+import httpx
+
+from london_golf.constants import HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUTS
+
+# Never hand httpx a zero/negative timeout: an expired deadline fails fast instead.
+_MIN_TIMEOUT = 0.05
+
+_current: contextvars.ContextVar[Optional["Deadline"]] = contextvars.ContextVar(
+    "london_golf_deadline", default=None
+)
+
+
+class Deadline:
+    """A named expiry time; children expire no later than their parent."""
+
+    __slots__ = ("name", "expires_at", "parent")
+
+    def __init__(self, seconds: float, name: str, parent: Optional["Deadline"] = None) -> None:
+        self.name = name
+        self.parent = parent
+        expires_at = time.monotonic() + max(0.0, seconds)
+        if parent is not None:
+            expires_at = min(expires_at, parent.expires_at)
+        self.expires_at = expires_at
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.name!r}, remaining={self.remaining():.1f}s)"
+
+    def child(self, seconds: float, name: str) -> "Deadline":
+        return Deadline(seconds, name, parent=self)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    @property
+    def root(self) -> "Deadline":
+        deadline = self
+        while deadline.parent is not None:
+            deadline = deadline.parent
+        return deadline
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def use_deadline(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` the active one for this task (``None`` clears it)."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def request_timeout(stage: str) -> httpx.Timeout:
+    """Timeout for one request of ``stage`` (poll, lock, cart, metadata), capped by the deadline.
+
+    Each stage has its own read cap from ``HTTP_READ_TIMEOUTS``; connect is capped by
+    ``HTTP_CONNECT_TIMEOUT``. With an active deadline neither may exceed the time left.
+    """
+    read = HTTP_READ_TIMEOUTS[stage]
+    connect = HTTP_CONNECT_TIMEOUT
+    deadline = _current.get()
+    if deadline is not None:
+        left = max(_MIN_TIMEOUT, deadline.remaining())
+        read = min(read, left)
+        connect = min(connect, left)
+    return httpx.Timeout(read, connect=connect, pool=connect)
@@ -0,0 +1,244 @@
+"""Tee-sheet history and a release-time model learned from it.
+
+Every polled sheet is appended to a small columnar store: one pair of ``array`` files
+per facility and date under ``HISTORY_DIR`` (``<date>.t`` observation times as doubles,
+``<date>.n`` open-foursome counts as unsigned ints); polls that failed are not recorded.
+A release shows up as a date's first non-empty sheet, right after the empty ones it was
+first watched with, on the day the date opens (``BOOK_INTERVAL`` days ahead); anything
+else is a cancellation on a full sheet. :class:`ReleaseModel` fits the release time of day
+per facility and weekday (median, or a linear drift once there are enough releases),
+so the search can sleep until just before the predicted release and then poll in a
+short burst instead of polling blind from the start. A prediction is computed once per
+facility and day (:func:`get_release_model`); one too uncertain to bound a short burst
+(spread over ``RELEASE_MAX_SPREAD``) is not used.
+"""
+
+import datetime as dt
+import logging
+import statistics
+import time
+import weakref
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from london_golf.constants import (
+    BOOK_INTERVAL,
+    BURST_INTERVAL,
+    BURST_LEAD,
+    BURST_SPAN,
+    HISTORY_DIR,
+    RELEASE_MAX_SPREAD,
+    RELEASE_MIN_SAMPLES,
+)
+
+_EASTERN = ZoneInfo("US/Eastern")
+# Observations further apart than this belong to different runs: no release between them.
+_MAX_GAP = 120.0
+
+
+@dataclass(frozen=True)
+class Release:
+    """One observed release: when it happened (epoch seconds) and its uncertainty."""
+
+    facility: str
+    book_date: str
+    at: float
+    bracket: float
+
+    @property
+    def eastern(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.at, _EASTERN)
+
+    @property
+    def seconds_of_day(self) -> float:
+        local = self.eastern
+        return local.hour * 3600 + local.minute * 60 + local.second + local.microsecond / 1e6
+
+
+@dataclass(frozen=True)
+class ReleasePlan:
+    """When to burst-poll one sheet: from ``start`` until ``end`` every ``interval`` seconds."""
+
+    release_at: float
+    start: float
+    end: float
+    interval: float
+    samples: int
+
+    def in_burst(self, now: float) -> bool:
+        return self.start <= now <= self.end
+
+
+class HistoryStore:
+    """Append-only per (facility, date) sheet history; writes are buffered until flush."""
+
+    def __init__(self, root: Path = Path(HISTORY_DIR)) -> None:
+        self.root = Path(root)
+        self._pending: Dict[Tuple[str, str], Tuple[array, array]] = {}
+
+    def record(self, facility: str, book_date: str, open_count: int, at: Optional[float] = None):
+        times, counts = self._pending.setdefault((facility, book_date), (array("d"), array("I")))
+        times.append(time.time() if at is None else at)
+        counts.append(open_count)
+
+    def _paths(self, facility: str, book_date: str) -> Tuple[Path, Path]:
+        base = self.root / facility / book_date
+        return base.with_suffix(".t"), base.with_suffix(".n")
+
+    def flush(self, logger: Optional[logging.Logger] = None) -> None:
+        pending, self._pending = self._pending, {}
+        for (facility, book_date), (times, counts) in pending.items():
+            t_path, n_path = self._paths(facility, book_date)
+            try:
+                t_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(t_path, "ab") as t_file, open(n_path, "ab") as n_file:
+                    times.tofile(t_file)
+                    counts.tofile(n_file)
+            except OSError as exc:
+                if logger is not None:
+                    logger.info("Failed to save tee-sheet history %s: %s", t_path, exc)
+
+    def load(self, facility: str, book_date: str) -> Tuple[array, array]:
+        """Stored observations plus any not yet flushed, as ``(times, counts)`` columns."""
+        times, counts = array("d"), array("I")
+        t_path, n_path = self._paths(facility, book_date)
+        if t_path.is_file() and n_path.is_file():
+            rows = min(t_path.stat().st_size // times.itemsize, n_path.stat().st_size // 4)
+            with open(t_path, "rb") as t_file, open(n_path, "rb") as n_file:
+                times.fromfile(t_file, rows)
+                counts.fromfile(n_file, rows)
+        pending = self._pending.get((facility, book_date))
+        if pending is not None:
+            times.extend(pending[0])
+            counts.extend(pending[1])
+        return times, counts
+
+    def dates(self, facility: str) -> List[str]:
+        folder = self.root / facility
+        if not folder.is_dir():
+            return []
+        return sorted(p.stem for p in folder.glob("*.t"))
+
+    def releases(self, facility: str) -> List[Release]:
+        """Releases seen for ``facility``, at most one per date."""
+        found = []
+        for book_date in self.dates(facility):
+            release = self._release(facility, book_date)
+            if release is not None:
+                found.append(release)
+        return found
+
+    def _release(self, facility: str, book_date: str) -> Optional[Release]:
+        """The date's first non-empty reading, if only empty ones of the same run precede it.
+
+        A date already open when first polled was released unobserved; a date that opens
+        on another day than its release day was sold out and had a cancellation.
+        """
+        times, counts = self.load(facility, book_date)
+        order = sorted(range(len(times)), key=times.__getitem__)
+        first = next((pos for pos, row in enumerate(order) if counts[row] > 0), None)
+        if not first:  # never opened, or open from the first reading
+            return None
+        prev, cur = order[first - 1], order[first]
+        gap = times[cur] - times[prev]
+        if not 0 < gap <= _MAX_GAP:
+            return None
+        at = times[prev] + gap / 2
+        try:
+            opens = dt.date.fromisoformat(book_date) - dt.timedelta(days=BOOK_INTERVAL)
+        except ValueError:
+            return None
+        # One day of slack for a release close to midnight.
+        if abs((dt.datetime.fromtimestamp(at, _EASTERN).date() - opens).days) > 1:
+            return None
+        return Release(facility, book_date, at, gap / 2)
+
+
+class ReleaseModel:
+    """Predict a facility's release time of day from its past releases.
+
+    Releases on the same weekday are preferred; with ``RELEASE_MIN_SAMPLES`` or more the
+    time of day is fitted against the date (least squares) to follow a drifting release,
+    otherwise the median is used. :meth:`plan` reads the history once per facility and
+    day and reuses that prediction afterwards.
+    """
+
+    def __init__(self, store: HistoryStore) -> None:
+        self.store = store
+        self._predicted: Dict[Tuple[str, dt.date], Optional[Tuple[float, int, float]]] = {}
+
+    @staticmethod
+    def _fit(points: List[Tuple[float, float]], day: float) -> float:
+        if len(points) < RELEASE_MIN_SAMPLES:
+            return statistics.median(y for _, y in points)
+        mean_x = statistics.fmean(x for x, _ in points)
+        mean_y = statistics.fmean(y for _, y in points)
+        var_x = sum((x - mean_x) ** 2 for x, _ in points)
+        if var_x == 0:
+            return mean_y
+        slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+        return mean_y + slope * (day - mean_x)
+
+    def predict(self, facility: str, on: dt.date) -> Optional[Tuple[float, int, float]]:
+        """``(epoch seconds, samples used, spread seconds)`` of the release on ``on``."""
+        releases = self.store.releases(facility)
+        if not releases:
+            return None
+        same_day = [r for r in releases if r.eastern.weekday() == on.weekday()]
+        chosen = same_day if len(same_day) >= 2 else releases
+        points = [(r.eastern.date().toordinal(), r.seconds_of_day) for r in chosen]
+        seconds = self._fit(points, on.toordinal())
+        spread = max(r.bracket for r in chosen)
+        if len(points) > 1:
+            spread = max(spread, statistics.pstdev(y for _, y in points))
+        midnight = dt.datetime.combine(on, dt.time(), _EASTERN)
+        return midnight.timestamp() + seconds, len(points), spread
+
+    def plan(self, facility: str, now: Optional[float] = None) -> Optional[ReleasePlan]:
+        """Burst window around today's predicted release.
+
+        None if there is no prediction, it is too uncertain (spread over
+        ``RELEASE_MAX_SPREAD``) or the window is already past.
+        """
+        now = time.time() if now is None else now
+        key = (facility, dt.datetime.fromtimestamp(now, _EASTERN).date())
+        if key not in self._predicted:
+            self._predicted[key] = self.predict(*key)
+        predicted = self._predicted[key]
+        if predicted is None:
+            return None
+        release_at, samples, spread = predicted
+        if spread > RELEASE_MAX_SPREAD:
+            return None
+        start = release_at - BURST_LEAD - spread
+        end = release_at + BURST_SPAN + spread
+        if now > end:
+            return None
+        return ReleasePlan(release_at, start, end, BURST_INTERVAL, samples)
+
+
+class _HistoryState:  # pylint: disable=too-few-public-methods
+    """Process-local history store shared by every search."""
+
+    store: Optional[HistoryStore] = None
+
+
+def get_history_store() -> HistoryStore:
+    """Return the process-wide tee-sheet history store."""
+    if _HistoryState.store is None:
+        _HistoryState.store = HistoryStore()
+    return _HistoryState.store
+
+
+_MODELS: "weakref.WeakKeyDictionary[HistoryStore, ReleaseModel]" = weakref.WeakKeyDictionary()
+
+
+def get_release_model(store: HistoryStore) -> ReleaseModel:
+    """Return the release model shared by every search over ``store``."""
+    model = _MODELS.get(store)
+    if model is None:
+        model = _MODELS[store] = ReleaseModel(store)
+    return model
@@ -0,0 +1,175 @@
+"""Lock leases: keep tee-time locks alive until checkout finishes, release them on abort.
+
+The lock API holds a slot for ``expiresIn`` only, while the browser checkout can take
+much longer. :class:`LeaseManager` checks each lock response, re-locks held slots in the
+background every ``LOCK_REFRESH_INTERVAL`` seconds and releases them if the run aborts.
+"""
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from london_golf.api_client import release_tee_time_lock, set_lock_tee_time
+from london_golf.constants import LOCK_REFRESH_INTERVAL
+from london_golf.deadline import use_deadline
+from london_golf.models import TeeTime
+
+
+@dataclass
+class LockLease:
+    """One held tee time and the outcome of its latest lock call."""
+
+    tee_time: TeeTime
+    acquired_at: float
+    refreshed_at: float
+    refreshes: int = 0
+    lost: bool = False
+    last_status: Optional[int] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def teetime(self) -> str:
+        return self.tee_time.teetime
+
+
+class LeaseManager:
+    """Acquire, refresh and release tee-time locks for one login session.
+
+    Use as ``async with LeaseManager(...) as leases``; leaving the block with an
+    exception (or without :meth:`complete`) releases every lease still held.
+    ``on_acquire`` is called with each tee time whose lock succeeds.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient,
+        login_session: str,
+        logger: logging.Logger,
+        refresh_interval: float = LOCK_REFRESH_INTERVAL,
+        on_acquire: Optional[Callable[[TeeTime], None]] = None,
+    ) -> None:
+        self._client = client
+        self._login_session = login_session
+        self._log = logger
+        self._refresh_interval = refresh_interval
+        self._on_acquire = on_acquire
+        # Keyed by the TeeTime itself: the same time on two courses is two leases.
+        self._leases: Dict[TeeTime, LockLease] = {}
+        self._refresher: Optional[asyncio.Task] = None
+        self._completed = False
+
+    @property
+    def held(self) -> List[LockLease]:
+        return [lease for lease in self._leases.values() if not lease.lost]
+
+    async def acquire(self, tee_time: TeeTime) -> httpx.Response:
+        """Lock a tee time; on success keep it refreshed until complete/release."""
+        response = await set_lock_tee_time(self._client, self._login_session, tee_time, self._log)
+        if response.is_success:
+            now = time.monotonic()
+            lease = LockLease(tee_time, now, now, last_status=response.status_code)
+            self._leases[tee_time] = lease
+            self._ensure_refresher()
+            if self._on_acquire is not None:
+                self._on_acquire(tee_time)
+        else:
+            self._log.info(
+                "[LEASE] lock rejected teetime=%s HTTP %s",
+                tee_time.teetime,
+                response.status_code,
+            )
+        return response
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is None or self._refresher.done():
+            self._refresher = asyncio.create_task(self._refresh_loop(), name="lock-lease-refresh")
+
+    async def _refresh_loop(self) -> None:
+        # Leases outlive the hold phase that started them; refresh without its deadline.
+        with use_deadline(None):
+            await self._refresh_held()
+
+    async def _refresh_held(self) -> None:
+        while self.held:
+            await asyncio.sleep(self._refresh_interval)
+            leases = self.held
+            results = await asyncio.gather(
+                *(
+                    set_lock_tee_time(self._client, self._login_session, lease.tee_time, self._log)
+                    for lease in leases
+                ),
+                return_exceptions=True,
+            )
+            for lease, result in zip(leases, results):
+                self._record_refresh(lease, result)
+
+    def _record_refresh(self, lease: LockLease, result: Any) -> None:
+        if isinstance(result, httpx.Response) and result.is_success:
+            lease.refreshed_at = time.monotonic()
+            lease.refreshes += 1
+            lease.last_status = result.status_code
+            return
+        if isinstance(result, httpx.Response):
+            lease.last_status = result.status_code
+            lease.errors.append(f"HTTP {result.status_code}")
+            # A definite rejection means someone else holds the slot now.
+            lease.lost = 400 <= result.status_code < 500
+        else:
+            lease.errors.append(repr(result))
+        self._log.info(
+            "[LEASE] refresh failed teetime=%s (%s)%s",
+            lease.teetime,
+            lease.errors[-1],
+            " - lease lost" if lease.lost else "",
+        )
+
+    async def _stop_refresher(self) -> None:
+        if self._refresher is not None:
+            self._refresher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresher
+            self._refresher = None
+
+    async def complete(self) -> None:
+        """Checkout finished: stop refreshing and leave the locks to the reservation."""
+        self._completed = True
+        await self._stop_refresher()
+        for lease in self._leases.values():
+            self._log.info(
+                "[LEASE] held teetime=%s for %.1fs (%s refreshes)",
+                lease.teetime,
+                time.monotonic() - lease.acquired_at,
+                lease.refreshes,
+            )
+
+    async def release(self, tee_time: TeeTime) -> None:
+        """Stop refreshing one lease and give its lock back (e.g. the cart call failed)."""
+        lease = self._leases.pop(tee_time, None)
+        if lease is not None and not lease.lost:
+            await release_tee_time_lock(self._client, self._login_session, tee_time, self._log)
+
+    async def release_all(self) -> None:
+        """Abort: stop refreshing and release every lease that is still held."""
+        await self._stop_refresher()
+        leases, self._leases = self.held, {}
+        # An aborted run may have used up its deadline; releases still get a full timeout.
+        with use_deadline(None):
+            for lease in leases:
+                try:
+                    await release_tee_time_lock(
+                        self._client, self._login_session, lease.tee_time, self._log
+                    )
+                except httpx.HTTPError as exc:
+                    self._log.info("[LEASE] release failed teetime=%s: %s", lease.teetime, exc)
+
+    async def __aenter__(self) -> "LeaseManager":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        if not self._completed:
+            await self.release_all()
@@ -1,22 +1,115 @@
-"""Configure the london_golf logger: rotating file and optional stderr."""
+"""Configure the london_golf logger: queued rotating file, optional stderr and JSON lines.
 
+Records are handed to a ``QueueHandler`` on the caller's thread and written by a
+``QueueListener`` thread, so file I/O never runs on the event loop. Hot-loop call
+sites tag records with :func:`sampled` to rate-limit them per key.
+"""
+
+import atexit
+import datetime as dt
+import json
 import logging
 import os
+import queue
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 _LOG_NAME = "london_golf"
+_TEXT_FORMAT = "%(asctime)s | %(levelname)-7s | %(message)s"
+
+# Records tagged with the same sample key: at most BURST per PERIOD seconds.
+LOG_SAMPLE_BURST = 8
+LOG_SAMPLE_PERIOD = 1.0
 
 
 class _LoggingState:  # pylint: disable=too-few-public-methods
     """Process-local flag: file handlers are attached only once per process."""
 
     configured = False
+    listener: Optional[QueueListener] = None
+
+
+def sampled(key: str) -> Dict[str, str]:
+    """Return ``extra=`` for a high-frequency log line rate-limited under ``key``."""
+    return {"sample_key": key}
+
+
+class _SamplingFilter(logging.Filter):
+    """Rate-limit records carrying ``sample_key``; untagged records always pass.
+
+    The first record let through after a suppressed run reports how many were dropped.
+    """
+
+    def __init__(self, burst: int, period: float) -> None:
+        super().__init__()
+        self._burst = burst
+        self._period = period
+        self._lock = threading.Lock()
+        # key -> (window start, emitted in window, suppressed since last emit)
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample_key", None)
+        if key is None:
+            return True
+        now = time.monotonic()
+        with self._lock:
+            start, emitted, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - start >= self._period:
+                start, emitted = now, 0
+            if emitted >= self._burst:
+                self._windows[key] = (start, emitted, suppressed + 1)
+                return False
+            self._windows[key] = (start, emitted + 1, 0)
+        if suppressed:
+            record.msg = f"{record.getMessage()} [{suppressed} similar suppressed]"
+            record.args = None
+            record.suppressed = suppressed
+        return True
+
+
+class _JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, msg plus sampling metadata."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": dt.datetime.fromtimestamp(record.created, dt.timezone.utc).isoformat(),
+            "level": record.levelname,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for attr in ("sample_key", "suppressed"):
+            val = getattr(record, attr, None)
+            if val is not None:
+                entry[attr] = val
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def _build_formatter() -> logging.Formatter:
+    if os.environ.get("LONDON_GOLF_LOG_FORMAT", "").lower() in ("json", "jsonl"):
+        return _JsonLinesFormatter()
+    return logging.Formatter(_TEXT_FORMAT)
+
+
+def _stop_listener() -> None:
+    listener = _LoggingState.listener
+    if listener is not None:
+        _LoggingState.listener = None
+        listener.stop()
 
 
 def get_logger():
-    """Return the application logger with rotating file under ./logs/."""
+    """Return the application logger; records are written by a background listener."""
     if _LoggingState.configured:
         return logging.getLogger(_LOG_NAME)
 
@@ -35,17 +128,25 @@ def get_logger():
         interval=1,
         backupCount=100,
         encoding="utf-8",
+        # Open the file on the first write (on the listener thread), not at startup.
+        delay=True,
     )
     handler.suffix = "%Y%m%d"
-    handler.setFormatter(logging.Formatter("%(asctime)s | %(levelname)-7s | %(message)s"))
-    logger.addHandler(handler)
-    log_stderr = os.environ.get("LONDON_GOLF_LOG_STDERR", "").lower()
-    if log_stderr in ("1", "true", "yes"):
+    handler.setFormatter(_build_formatter())
+    handlers = [handler]
+    if _env_flag("LONDON_GOLF_LOG_STDERR"):
         stream_handler = logging.StreamHandler(sys.stderr)
-        stream_handler.setFormatter(
-            logging.Formatter("%(asctime)s | %(levelname)-7s | %(message)s")
-        )
-        logger.addHandler(stream_handler)
+        stream_handler.setFormatter(logging.Formatter(_TEXT_FORMAT))
+        handlers.append(stream_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(_SamplingFilter(LOG_SAMPLE_BURST, LOG_SAMPLE_PERIOD))
+    logger.addHandler(queue_handler)
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _LoggingState.listener = listener
+    atexit.register(_stop_listener)
 
     _LoggingState.configured = True
     return logger
@@ -0,0 +1,311 @@
+"""Facility, course and rate metadata cached on disk ahead of the release window.
+
+Cart and lock bodies need ids, player counts, terms and notes that the API repeats on
+every tee time's ``rates[0]``. :class:`MetadataStore` extracts them once per rate id
+(when a sheet is first parsed), so the booking hot path only does a dict lookup.
+Fields a tee time may set for itself (``TEE_CART_KEYS``) stay on its
+:class:`~london_golf.models.TeeTime` and take precedence over the rate's at cart time.
+"""
+
+import asyncio
+import datetime as dt
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from london_golf.constants import (
+    BOOK_INTERVAL,
+    ENDPOINTS,
+    HEADERS,
+    METADATA_CACHE_FILE,
+    METADATA_TTL,
+)
+from london_golf.deadline import request_timeout
+from london_golf.models import TeeTime
+
+# Cart fields read from the tee time itself before falling back to its rate.
+TEE_CART_KEYS: Tuple[str, ...] = (
+    "isPnasSelected",
+    "productLineups",
+    "featuredProducts",
+    "termsAndConditions",
+    "termsAndConditionsText",
+    "cancellationTerms",
+    "teetimeNotes",
+    "rateDescription",
+    "description",
+    "notes",
+    "longDescription",
+)
+
+
+def tee_cart_fields(tee_time_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """The ``TEE_CART_KEYS`` a raw tee time sets, or None if it sets none."""
+    fields = {key: tee_time_info[key] for key in TEE_CART_KEYS if key in tee_time_info}
+    return fields or None
+
+
+def _coerce_cart_int(value: Any) -> Any:
+    """Cart API expects integer ids; JSON may use str or float."""
+    if value is None or isinstance(value, bool):
+        return value
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    try:
+        return int(str(value).strip(), 10)
+    except (TypeError, ValueError):
+        return value
+
+
+def _cart_terms_and_conditions(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> str:
+    for src in (tee_time_info, rate):
+        for key in (
+            "termsAndConditions",
+            "termsAndConditionsText",
+            "cancellationTerms",
+        ):
+            val = src.get(key)
+            if val:
+                return str(val)
+    return ""
+
+
+def _cart_teetime_notes(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> str:
+    for src in (tee_time_info, rate):
+        for key in (
+            "teetimeNotes",
+            "rateDescription",
+            "description",
+            "notes",
+            "longDescription",
+        ):
+            val = src.get(key)
+            if val:
+                return str(val)
+    return ""
+
+
+def _cart_product_lineups(tee_time_info: Dict[str, Any], rate: Dict[str, Any]) -> List[Any]:
+    raw = tee_time_info.get("productLineups")
+    if raw is None:
+        raw = rate.get("productLineups")
+    if raw is None:
+        raw = tee_time_info.get("featuredProducts")
+    if raw is None:
+        raw = rate.get("featuredProducts")
+    return list(raw) if isinstance(raw, list) else []
+
+
+@dataclass(frozen=True)
+class RateMeta:  # pylint: disable=too-many-instance-attributes
+    """Everything the cart and lock bodies need from a rate, already coerced.
+
+    Only rate-level values: ``is_pnas``, ``terms``, ``notes`` and the raw
+    ``product_lineups``/``featured_products`` are fallbacks for what each tee time sets.
+    """
+
+    rate_id: Any
+    facility_id: Any
+    rate_set_id: Any
+    players: int
+    holes: int
+    name: str
+    transportation: str
+    is_simulator: bool
+    is_pnas: bool
+    terms: str
+    notes: str
+    product_lineups: Any = None
+    featured_products: Any = None
+    fetched_at: float = 0.0
+
+    @classmethod
+    def from_tee_time(cls, tee_time_info: Dict[str, Any]) -> "RateMeta":
+        """Parse a raw tee time's first rate, ignoring the tee time's own cart fields."""
+        rate = tee_time_info["rates"][0]
+        gn = rate["golfnow"]
+        return cls(
+            rate_id=_coerce_cart_int(rate["_id"]),
+            facility_id=_coerce_cart_int(gn["GolfFacilityId"]),
+            rate_set_id=_coerce_cart_int(gn["GolfCourseId"]),
+            players=int(rate["allowedPlayers"][-1]),
+            holes=int(rate["holes"]),
+            name=rate["name"],
+            transportation=str(rate.get("transportation") or rate.get("name") or "Walking"),
+            is_simulator=bool(rate["isSimulator"]),
+            is_pnas=bool(rate.get("isPnasSelected", False)),
+            terms=_cart_terms_and_conditions({}, rate),
+            notes=_cart_teetime_notes({}, rate),
+            product_lineups=rate.get("productLineups"),
+            featured_products=rate.get("featuredProducts"),
+            fetched_at=time.time(),
+        )
+
+
+class MetadataStore:
+    """Rate and course metadata keyed by rate id / course id, persisted as JSON with a TTL."""
+
+    def __init__(self, path: str = METADATA_CACHE_FILE, ttl: float = METADATA_TTL) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.rates: Dict[str, RateMeta] = {}
+        self.courses: Dict[str, Dict[str, Any]] = {}
+        self.facilities: Dict[str, float] = {}
+        self._loaded = False
+
+    def _fresh(self, fetched_at: float) -> bool:
+        return time.time() - fetched_at < self.ttl
+
+    def load(self, logger: Optional[logging.Logger] = None) -> None:
+        """Read unexpired entries from disk once; a missing or bad file means empty."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, encoding="utf-8") as file_handle:
+                data = json.load(file_handle)
+            for key, raw in data.get("rates", {}).items():
+                try:
+                    meta = RateMeta(**raw)
+                except TypeError:  # written with other fields; re-parsed from the next sheet
+                    continue
+                if self._fresh(meta.fetched_at):
+                    self.rates[key] = meta
+            for key, raw in data.get("courses", {}).items():
+                if self._fresh(raw.get("fetched_at", 0.0)):
+                    self.courses[key] = raw
+            self.facilities = {
+                key: ts for key, ts in data.get("facilities", {}).items() if self._fresh(ts)
+            }
+        except (OSError, json.JSONDecodeError, TypeError, AttributeError) as exc:
+            if logger:
+                logger.info("Failed to load metadata cache: %s. Starting empty.", exc)
+
+    def save(self, logger: Optional[logging.Logger] = None) -> None:
+        data = {
+            "rates": {key: asdict(meta) for key, meta in self.rates.items()},
+            "courses": self.courses,
+            "facilities": self.facilities,
+        }
+        try:
+            with open(self.path, "w", encoding="utf-8") as file_handle:
+                json.dump(data, file_handle)
+        except (OSError, TypeError) as exc:
+            if logger:
+                logger.info("Failed to save metadata cache: %s", exc)
+
+    def remember(self, tee_times: Iterable[Dict[str, Any]]) -> int:
+        """Index the rates of a tee sheet; return how many new rate ids were added."""
+        added = 0
+        for tee_time_info in tee_times:
+            try:
+                key = str(tee_time_info["rates"][0]["_id"])
+                if key in self.rates:
+                    continue
+                meta = RateMeta.from_tee_time(tee_time_info)
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+            self.rates[key] = meta
+            added += 1
+        return added
+
+    def rate_for(self, tee_time: TeeTime) -> RateMeta:
+        """Return metadata for a parsed tee time; its rate was indexed when it was parsed."""
+        return self.rates[tee_time.rate_key]
+
+    def cart_fields(self, tee_time: TeeTime, meta: RateMeta) -> Dict[str, Any]:
+        """Per-slot cart values: the tee time's own, then its rate's, then its course's."""
+        own = tee_time.cart_fields or {}
+        rate = {"productLineups": meta.product_lineups, "featuredProducts": meta.featured_products}
+        terms = _cart_terms_and_conditions(own, {}) or meta.terms
+        notes = _cart_teetime_notes(own, {}) or meta.notes
+        if not (terms and notes):
+            course = self.courses.get(tee_time.course_id) or {}
+            terms = terms or _cart_terms_and_conditions(course, {})
+            notes = notes or _cart_teetime_notes(course, {})
+        return {
+            "is_pnas": bool(own.get("isPnasSelected", meta.is_pnas)),
+            "product_lineups": _cart_product_lineups(own, rate),
+            "terms": terms,
+            "notes": notes,
+        }
+
+    async def prefetch(
+        self,
+        client: httpx.AsyncClient,
+        facility_codes: Iterable[str],
+        logger: logging.Logger,
+    ) -> None:
+        """Warm rate and course metadata for facilities whose entries are missing or expired.
+
+        The release date has no sheet yet, so rates come from the most recent released
+        date (today + BOOK_INTERVAL - 1); course details come from ``ENDPOINTS["course"]``.
+        """
+        self.load(logger)
+        stale = [str(c) for c in dict.fromkeys(facility_codes) if str(c) not in self.facilities]
+        if not stale:
+            logger.info("Metadata cache fresh for %s facilities", len(self.facilities))
+            return
+        sample_date = (dt.date.today() + dt.timedelta(days=BOOK_INTERVAL - 1)).isoformat()
+        results = await asyncio.gather(
+            *(self._prefetch_facility(client, code, sample_date, logger) for code in stale),
+            return_exceptions=True,
+        )
+        for code, result in zip(stale, results):
+            if isinstance(result, BaseException):
+                logger.info("Metadata prefetch failed for facility %s: %s", code, result)
+        self.save(logger)
+
+    async def _prefetch_facility(
+        self, client: httpx.AsyncClient, code: str, sample_date: str, logger: logging.Logger
+    ) -> None:
+        response = await client.get(
+            ENDPOINTS["tee_time"].format(sample_date, code),
+            headers=HEADERS,
+            timeout=request_timeout("metadata"),
+        )
+        response.raise_for_status()
+        tee_times = response.json()[0]["teetimes"]
+        course_ids = {str(t["courseId"]) for t in tee_times if t.get("courseId")}
+        for course_id in course_ids - set(self.courses):
+            detail = await client.get(
+                f"{ENDPOINTS['course']}/{course_id}",
+                headers=HEADERS,
+                timeout=request_timeout("metadata"),
+            )
+            if detail.is_success:
+                payload = detail.json()
+                if isinstance(payload, dict):
+                    self.courses[course_id] = {**payload, "fetched_at": time.time()}
+        added = self.remember(tee_times)
+        self.facilities[code] = time.time()
+        logger.info(
+            "Metadata prefetch facility=%s date=%s courses=%s new_rates=%s",
+            code,
+            sample_date,
+            len(course_ids),
+            added,
+        )
+
+
+class _MetadataState:  # pylint: disable=too-few-public-methods
+    """Process-local store shared by every search and the cart builder."""
+
+    store: Optional[MetadataStore] = None
+
+
+def get_metadata_store() -> MetadataStore:
+    """Return the process-wide metadata store, loading the disk cache on first use."""
+    if _MetadataState.store is None:
+        _MetadataState.store = MetadataStore()
+        _MetadataState.store.load()
+    return _MetadataState.store
@@ -0,0 +1,69 @@
+"""Compact tee-time records passed through the search, lock and cart pipeline.
+
+``get_tee_times`` turns each open foursome into a :class:`TeeTime` once; the raw JSON is
+dropped after parsing. Rate details live in the metadata store under ``rate_key``;
+the few cart fields a tee time may set for itself are kept in ``cart_fields``.
+"""
+
+import datetime as dt
+from typing import Any, Dict, Optional
+
+TEE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.000Z"
+
+
+class TeeTime:
+    """An open tee time: only what the lock and cart calls need.
+
+    ``teetime`` keeps the API's fixed-width UTC string, which sorts chronologically,
+    so window checks can compare strings without parsing.
+    """
+
+    __slots__ = ("teetime", "course_id", "rate_key", "price", "cart_fields")
+
+    def __init__(
+        self,
+        teetime: str,
+        course_id: str,
+        rate_key: str,
+        price: float,
+        cart_fields: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.teetime = teetime
+        self.course_id = course_id
+        self.rate_key = rate_key
+        self.price = price
+        # Tee-time-level cart fields (metadata.TEE_CART_KEYS); None when it sets none.
+        self.cart_fields = cart_fields
+
+    def __repr__(self) -> str:
+        return f"TeeTime({self.teetime!r}, course={self.course_id!r}, rate={self.rate_key!r})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TeeTime):
+            return NotImplemented
+        return (self.teetime, self.course_id, self.rate_key) == (
+            other.teetime,
+            other.course_id,
+            other.rate_key,
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.teetime, self.course_id, self.rate_key))
+
+
+class Candidate:
+    """A tee time inside the booking window, with its Eastern time and dedup state."""
+
+    __slots__ = ("tee", "eastern", "validation_key", "cached")
+
+    def __init__(
+        self, tee: TeeTime, eastern: dt.datetime, validation_key: str, cached: bool
+    ) -> None:
+        self.tee = tee
+        self.eastern = eastern
+        self.validation_key = validation_key
+        self.cached = cached
+
+    @property
+    def east_hm(self) -> str:
+        return self.eastern.strftime("%H:%M")
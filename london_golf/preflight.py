@@ -0,0 +1,106 @@
+"""``--preflight``: check everything a run needs except the browser session itself.
+
+Validates the config and every task's credentials and schedule, resolves the
+deduplication cache (connecting Redis if configured) and the course metadata cache,
+and warms the Kenna API by prefetching metadata, which leaves the metadata cache fresh
+for the real run. Playwright is only asked where its Chromium lives and, with
+``--cdp-endpoint``, whether the running browser answers; no browser is launched.
+"""
+
+import time
+from pathlib import Path
+from typing import List, Optional
+
+from playwright.async_api import Error as PlaywrightError
+from playwright.async_api import async_playwright
+
+from london_golf.api_client import create_client
+from london_golf.cache import get_cache
+from london_golf.config_loader import (
+    AppConfig,
+    get_task_credentials,
+    get_task_facility_codes,
+    get_task_schedule_entries,
+)
+from london_golf.constants import BROWSER_ATTACH_TIMEOUT
+from london_golf.exceptions import ConfigError
+from london_golf.logging_config import get_logger
+from london_golf.metadata import get_metadata_store
+
+_OK, _WARN, _FAIL = "OK", "WARN", "FAIL"
+
+
+def _report(status: str, check: str, detail: str) -> None:
+    line = f"[PREFLIGHT] {status:<4} {check}: {detail}"
+    print(line)
+    get_logger().info("%s", line)
+
+
+async def run_preflight(
+    config: AppConfig, task_names: List[str], cdp_endpoint: Optional[str] = None
+) -> bool:
+    """Run every check, print one line each; True if nothing failed."""
+    log = get_logger()
+    failed = False
+
+    codes: List[str] = []
+    for task_name in task_names:
+        try:
+            userid, _ = get_task_credentials(config, task_name)
+            tasks_dict = get_task_schedule_entries(config, task_name)
+            codes.extend(get_task_facility_codes(config, tasks_dict))
+        except ConfigError as exc:
+            _report(_FAIL, f"task {task_name}", str(exc))
+            failed = True
+            continue
+        except KeyError as exc:
+            _report(_FAIL, f"task {task_name}", f"unknown course {exc}")
+            failed = True
+            continue
+        _report(_OK, f"task {task_name}", f"login {userid}, {len(tasks_dict)} weekday rows")
+    codes = list(dict.fromkeys(codes))
+
+    cache = get_cache(config, log)
+    redis_configured = cache.use_redis
+    cache.get("london_golf:preflight")
+    if cache.use_redis:
+        pool = cache.redis_connection.connection_pool.connection_kwargs
+        _report(_OK, "dedup cache", f"redis {pool['host']}:{pool['port']}")
+    else:
+        status = _WARN if redis_configured else _OK
+        _report(status, "dedup cache", f"local file {cache.cache_file}")
+
+    metadata = get_metadata_store()
+    started = time.monotonic()
+    async with create_client() as client:
+        await metadata.prefetch(client, codes, log)
+    missing = [code for code in codes if code not in metadata.facilities]
+    detail = (
+        f"{len(codes) - len(missing)}/{len(codes)} facilities in {time.monotonic() - started:.2f}s"
+    )
+    if missing:
+        _report(_FAIL, "metadata", f"{detail}; missing {', '.join(missing)}")
+        failed = True
+    else:
+        _report(_OK, "metadata", detail)
+
+    async with async_playwright() as playwright:
+        executable = Path(playwright.chromium.executable_path)
+        if cdp_endpoint:
+            try:
+                browser = await playwright.chromium.connect_over_cdp(
+                    cdp_endpoint, timeout=BROWSER_ATTACH_TIMEOUT * 1000
+                )
+                _report(_OK, "cdp endpoint", f"{cdp_endpoint} ({browser.version})")
+                await browser.close()
+            except PlaywrightError as exc:
+                _report(
+                    _WARN, "cdp endpoint", f"{cdp_endpoint} unreachable, runs will launch: {exc}"
+                )
+    if executable.exists():
+        _report(_OK, "browser", str(executable))
+    else:
+        _report(_FAIL, "browser", f"{executable} missing; run `playwright install chromium`")
+        failed = True
+
+    return not failed
@@ -0,0 +1,168 @@
+"""Opt-in run profiling (``--profile DIR``): per-phase cProfile dumps and a loop-lag monitor.
+
+:class:`PhaseProfiler` profiles each phase of a run (login, prefetch, search, checkout)
+separately and writes ``DIR/<phase>.prof`` in the standard pstats format, readable with
+``python -m pstats`` or snakeviz. :class:`LoopLagMonitor` reports every event-loop stall
+longer than ``LOOP_LAG_THRESHOLD`` together with the stack that was running when it
+was caught, which points at blocking cache, file or logging calls on the loop.
+"""
+
+import asyncio
+import contextlib
+import cProfile
+import io
+import logging
+import pstats
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from london_golf.constants import LOOP_LAG_INTERVAL, LOOP_LAG_THRESHOLD
+
+
+class PhaseProfiler:
+    """Profile named phases into ``out_dir``; with ``out_dir=None`` phases only run."""
+
+    def __init__(self, out_dir: Optional[Path], logger: logging.Logger) -> None:
+        self.out_dir = Path(out_dir) if out_dir is not None else None
+        self._log = logger
+        self.timings: Dict[str, float] = {}
+        if self.out_dir is not None:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.out_dir is not None
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            self.timings[name] = self.timings.get(name, 0.0) + elapsed
+            path = self.out_dir / f"{name}.prof"
+            profile.dump_stats(str(path))
+            self._log.info(
+                "[PROFILE] phase=%s wall=%.3fs cpu_top=%s -> %s",
+                name,
+                elapsed,
+                _top_functions(profile, 3),
+                path,
+            )
+
+    def write_summary(self) -> Optional[Path]:
+        """Write ``summary.txt``: wall time per phase and its top cumulative functions."""
+        if not self.enabled:
+            return None
+        path = self.out_dir / "summary.txt"
+        with path.open("w", encoding="utf-8") as file_handle:
+            for name, elapsed in self.timings.items():
+                file_handle.write(f"== {name}: {elapsed:.3f}s wall\n")
+                stream = io.StringIO()
+                stats = pstats.Stats(str(self.out_dir / f"{name}.prof"), stream=stream)
+                stats.sort_stats("cumulative").print_stats(15)
+                file_handle.write(stream.getvalue())
+                file_handle.write("\n")
+        return path
+
+
+def _top_functions(profile: cProfile.Profile, count: int) -> List[str]:
+    stats = pstats.Stats(profile)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+    return [f"{func[2]}:{func[1]}={timing[2]:.3f}s" for func, timing in rows[:count]]
+
+
+class LoopLagMonitor:
+    """Detect event-loop stalls from a watchdog thread and log the blocking stack.
+
+    A heartbeat task stamps the time every ``interval`` seconds. When the watchdog
+    sees no stamp for ``threshold`` seconds, the loop is stuck in synchronous code, so
+    the loop thread's current stack is captured; the stall is logged with its full
+    length once the heartbeat resumes.
+    """
+
+    def __init__(
+        self,
+        logger: logging.Logger,
+        threshold: float = LOOP_LAG_THRESHOLD,
+        interval: float = LOOP_LAG_INTERVAL,
+    ) -> None:
+        self._log = logger
+        self.threshold = threshold
+        self.interval = interval
+        self.stalls: List[float] = []
+        self._beat = time.monotonic()
+        self._stack: Optional[str] = None
+        self._loop_thread: Optional[int] = None
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            self._beat = time.monotonic()
+            await asyncio.sleep(self.interval)
+            lag = time.monotonic() - self._beat - self.interval
+            if lag >= self.threshold:
+                self._report(lag)
+
+    def _report(self, lag: float) -> None:
+        self.stalls.append(lag)
+        stack, self._stack = self._stack, None
+        self._log.info(
+            "[LOOP-LAG] event loop blocked for %.3fs%s",
+            lag,
+            f"; stack when caught:\n{stack}" if stack else "",
+        )
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            if self._stack is not None or self._loop_thread is None:
+                continue
+            if time.monotonic() - self._beat < self.threshold + self.interval:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)  # pylint: disable=protected-access
+            if frame is not None:
+                self._stack = "".join(traceback.format_stack(frame))
+
+    def start(self) -> None:
+        """Start monitoring the running loop; call from inside it."""
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop(), name="loop-lag-heartbeat")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._heartbeat
+        if self._watchdog is not None:
+            self._watchdog.join()
+        if self.stalls:
+            self._log.info(
+                "[LOOP-LAG] %s stalls over %.0fms, worst %.3fs",
+                len(self.stalls),
+                self.threshold * 1000,
+                max(self.stalls),
+            )
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.stop()
@@ -0,0 +1,240 @@
+"""Record Kenna traffic to compressed JSON lines and replay it offline.
+
+Recording is opt-in (``--record PATH``): :class:`RecordingTransport` wraps the real
+transport and hands every request/response pair with its timing to a :class:`Recorder`,
+which writes gzip JSON lines from a background thread. :class:`ReplayTransport` serves a
+recording back to ``httpx.AsyncClient``, either paced like the original run or as fast
+as possible, so the search pipeline can be profiled against real payloads::
+
+    python -m london_golf.recorder RECORDING TASK [-c CONFIG] [--realtime]
+"""
+
+import argparse
+import asyncio
+import bisect
+import datetime as dt
+import gzip
+import json
+import queue
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+_STOP = object()
+
+
+def endpoint_label(url: httpx.URL) -> str:
+    """Name the Kenna endpoint a URL belongs to (tee_times, lock, cart_item, ...)."""
+    path = url.path
+    if path.endswith("/tee-times"):
+        return "tee_times"
+    if path.endswith("/tee-time/lock"):
+        return "lock"
+    if path.endswith("/cart-item"):
+        return "cart_item"
+    if "/course" in path:
+        return "course"
+    return "other"
+
+
+def _replay_key(method: str, url: httpx.URL) -> Tuple[str, ...]:
+    label = endpoint_label(url)
+    if label == "tee_times":
+        return (method, label, url.params.get("facilityIds", ""), url.params.get("date", ""))
+    return (method, label)
+
+
+class Recorder:
+    """Append request/response entries to a gzip JSON-lines file off the event loop."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._origin = time.monotonic()
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer = threading.Thread(target=self._drain, name="recorder", daemon=True)
+        self._writer.start()
+        self.count = 0
+
+    def _drain(self) -> None:
+        with gzip.open(self.path, "at", encoding="utf-8") as file_handle:
+            while True:
+                entry = self._queue.get()
+                if entry is _STOP:
+                    break
+                file_handle.write(json.dumps(entry, ensure_ascii=False))
+                file_handle.write("\n")
+
+    def record(
+        self, request: httpx.Request, response: httpx.Response, started: float, elapsed: float
+    ) -> None:
+        """Queue one exchange; ``started`` is a ``time.monotonic()`` reading."""
+        self.count += 1
+        self._queue.put(
+            {
+                "t": round(started - self._origin, 6),
+                "elapsed": round(elapsed, 6),
+                "label": endpoint_label(request.url),
+                "method": request.method,
+                "url": str(request.url),
+                "request_body": request.content.decode("utf-8", "replace") or None,
+                "status": response.status_code,
+                "headers": {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() in ("content-type", "etag")
+                },
+                "body": response.content.decode("utf-8", "replace"),
+            }
+        )
+
+    def close(self) -> None:
+        """Flush queued entries and close the file."""
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Pass requests to ``inner`` and record each completed exchange."""
+
+    def __init__(self, recorder: Recorder, inner: Optional[httpx.AsyncBaseTransport] = None):
+        self._recorder = recorder
+        self._inner = inner or httpx.AsyncHTTPTransport()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        started = time.monotonic()
+        response = await self._inner.handle_async_request(request)
+        await response.aread()
+        self._recorder.record(request, response, started, time.monotonic() - started)
+        return response
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+
+def load_recording(path: Path) -> List[Dict[str, Any]]:
+    with gzip.open(path, "rt", encoding="utf-8") as file_handle:
+        return [json.loads(line) for line in file_handle if line.strip()]
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serve recorded responses by endpoint (and facility/date for tee sheets).
+
+    ``realtime=True`` returns, for each request, the response that was current at the
+    same offset into the recording and waits the recorded latency; otherwise entries
+    for a key are served in order without waiting, repeating the last one.
+    """
+
+    def __init__(self, entries: List[Dict[str, Any]], realtime: bool = False) -> None:
+        self.realtime = realtime
+        self.served = 0
+        self._entries: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+        for entry in sorted(entries, key=lambda e: e["t"]):
+            key = _replay_key(entry["method"], httpx.URL(entry["url"]))
+            self._entries[key].append(entry)
+        self._times = {key: [e["t"] for e in items] for key, items in self._entries.items()}
+        self._cursor: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._first_t = min((e["t"] for e in entries), default=0.0)
+        self._origin: Optional[float] = None
+
+    @property
+    def tee_sheets(self) -> List[Tuple[str, str]]:
+        """Recorded ``(facility, date)`` pairs, in order of first appearance."""
+        keys = [k for k in self._entries if k[1] == "tee_times"]
+        keys.sort(key=lambda k: self._times[k][0])
+        return [(k[2], k[3]) for k in keys]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        key = _replay_key(request.method, request.url)
+        entries = self._entries.get(key)
+        if not entries:
+            return httpx.Response(404, json={"error": "not in recording"}, request=request)
+        if self.realtime:
+            now = asyncio.get_running_loop().time()
+            if self._origin is None:
+                self._origin = now - self._first_t
+            idx = max(0, bisect.bisect_right(self._times[key], now - self._origin) - 1)
+            entry = entries[idx]
+            await asyncio.sleep(entry["elapsed"])
+        else:
+            idx = min(self._cursor[key], len(entries) - 1)
+            self._cursor[key] += 1
+            entry = entries[idx]
+        self.served += 1
+        return httpx.Response(
+            entry["status"],
+            headers=entry["headers"],
+            content=entry["body"].encode("utf-8"),
+            request=request,
+        )
+
+
+async def _replay(args: argparse.Namespace) -> None:
+    # Imported here so recording support does not pull in the schedule stack.
+    # pylint: disable=import-outside-toplevel
+    from london_golf.cache import CacheManager
+    from london_golf.config_loader import (
+        get_task_schedule_entries,
+        load_config,
+        resolve_default_config_path,
+    )
+    from london_golf.constants import POLL_INTERVAL, WEEKDAY
+    from london_golf.logging_config import get_logger
+    from london_golf.schedule import PollStrategy, get_book_schedule
+
+    log = get_logger()
+    config = load_config(args.config or resolve_default_config_path())
+    tasks_dict = get_task_schedule_entries(config, args.task)
+    by_code = {str(c.code): key for key, c in config.course.items()}
+    transport = ReplayTransport(load_recording(args.recording), realtime=args.realtime)
+    strategy = PollStrategy(poll_interval=POLL_INTERVAL if args.realtime else 0.0)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+        for facility, book_date in transport.tee_sheets:
+            weekday = WEEKDAY[dt.date.fromisoformat(book_date).weekday()]
+            row = tasks_dict.get(weekday)
+            if row is None or facility not in by_code:
+                print(f"skip {facility} {book_date}: no matching schedule row/course")
+                continue
+            row = row.model_copy(update={"course": [by_code[facility]]})
+            served = transport.served
+            started = time.perf_counter()
+            selected = await get_book_schedule(
+                client,
+                row,
+                args.task,
+                "replay-cart",
+                "replay-session",
+                config,
+                weekday,
+                book_date=book_date,
+                strategy=strategy,
+                cache=CacheManager({}, log, cache_file=None),
+            )
+            print(
+                f"{facility} {book_date}: selected={[t.teetime for t in selected]} "
+                f"requests={transport.served - served} "
+                f"wall={time.perf_counter() - started:.3f}s"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay a recorded run through the search")
+    parser.add_argument("recording", type=Path, help="gzip JSON-lines file from --record")
+    parser.add_argument("task", help="Schedule task name whose rows drive the search")
+    parser.add_argument("-c", "--config", type=Path, default=None, help="YAML config path")
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="Pace polls and latencies like the recording instead of as fast as possible",
+    )
+    asyncio.run(_replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
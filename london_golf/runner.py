@@ -0,0 +1,289 @@
+"""One task end to end: browser login, metadata prefetch, search or watch, checkout.
+
+Imported lazily by :mod:`london_golf.cli` so argument parsing, ``--help`` and
+``--preflight`` never pay for Playwright and the booking stack.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import logging
+import sys
+import traceback
+from pathlib import Path
+from typing import Callable, Optional
+
+import httpx
+from playwright.async_api import async_playwright
+
+from london_golf.api_client import create_client, warm_body_templates
+from london_golf.browser import (
+    CheckoutPreloader,
+    do_login_and_get_sessions,
+    open_browser,
+)
+from london_golf.config_loader import (
+    AppConfig,
+    get_task_credentials,
+    get_task_facility_codes,
+    get_task_schedule_entries,
+)
+from london_golf.constants import (
+    AFTER_FIRST_BOOKING,
+    BOOK_INTERVAL,
+    CHECKOUT_DEADLINE,
+    ENDPOINTS,
+    HOLD_DEADLINE,
+    SEARCH_DEADLINE,
+    TIMEOUT,
+    WEEKDAY,
+)
+from london_golf.deadline import Deadline, use_deadline
+from london_golf.lease import LeaseManager
+from london_golf.logging_config import get_logger
+from london_golf.metadata import get_metadata_store
+from london_golf.models import TeeTime
+from london_golf.profiling import LoopLagMonitor, PhaseProfiler
+from london_golf.recorder import Recorder
+from london_golf.schedule import search_schedule_rows
+from london_golf.watch import build_watch_targets, watch_for_cancellations
+
+
+def _log_phase_banner(logger: logging.Logger, task_name: str, *, start: bool) -> None:
+    label = "START" if start else "END"
+    logger.info(
+        "[%s] -------------------------------- %s --------------------------------",
+        task_name,
+        label,
+    )
+
+
+def _log_traceback(logger: logging.Logger, traceback_msg: str) -> None:
+    sep = "[ERROR]" + "-" * 100
+    logger.info("%s", sep)
+    logger.info("%s", traceback_msg)
+    logger.info("%s", sep)
+    print(sep, file=sys.stderr)
+    print(traceback_msg, file=sys.stderr)
+    print(sep, file=sys.stderr)
+
+
+async def _run_schedules_async(
+    client: httpx.AsyncClient,
+    config: AppConfig,
+    task_name: str,
+    tasks_dict: dict,
+    cart_session: str,
+    login_session: str,
+    logger: logging.Logger,
+    leases: Optional[LeaseManager] = None,
+    deadline: float = SEARCH_DEADLINE,
+    after_first: str = AFTER_FIRST_BOOKING,
+) -> bool:
+    target_date = dt.datetime.now() + dt.timedelta(days=BOOK_INTERVAL)
+    default_target = WEEKDAY[target_date.weekday()]
+
+    logger.info(
+        "[%s] Target booking date: %s (%s)",
+        task_name,
+        target_date.strftime("%Y-%m-%d"),
+        default_target,
+    )
+
+    rows = []
+    seen_rows = set()
+    for weekday, schedule_info in tasks_dict.items():
+        # If no explicit book_date override, only execute the default target weekday
+        if not schedule_info.book_date and weekday != default_target:
+            continue
+        # Weekdays inheriting the same row share its dates; search them together once
+        if id(schedule_info) in seen_rows:
+            continue
+        seen_rows.add(id(schedule_info))
+        weekdays = (
+            [day for day, row in tasks_dict.items() if row is schedule_info]
+            if schedule_info.book_date
+            else [weekday]
+        )
+        rows.append((schedule_info, weekdays))
+
+    if not rows:
+        return False
+    selected = await search_schedule_rows(
+        client,
+        rows,
+        task_name,
+        cart_session,
+        login_session,
+        config,
+        deadline=deadline,
+        after_first=after_first,
+        leases=leases,
+    )
+    return bool(selected)
+
+
+def _task_output_path(path: Optional[Path], task_name: str, multi: bool) -> Optional[Path]:
+    """With several tasks per run, give each task its own recording/profile path."""
+    if path is None or not multi:
+        return path
+    return path.with_name(f"{task_name}-{path.name}")
+
+
+async def run_task(
+    args: argparse.Namespace,
+    config: AppConfig,
+    task_name: str,
+    on_stage: Optional[Callable[[str, str], None]] = None,
+) -> bool:
+    """Log in, search and check out one task; True if a tee time was held.
+
+    ``on_stage(task_name, stage)`` is called when the task first holds a lock
+    (``"hold"``) and before checkout starts (``"checkout"``).
+    """
+    logger = get_logger()
+    multi = len(args.task) > 1
+    found = False
+    _log_phase_banner(logger, task_name, start=True)
+
+    logger.info("[%s] Initializing... Headless: %s", task_name, args.headless)
+    login_uid, login_pwd = get_task_credentials(config, task_name)
+
+    is_headless = args.headless
+    record_path = _task_output_path(args.record, task_name, multi)
+    recorder = Recorder(record_path) if record_path else None
+    if recorder:
+        logger.info("[%s] Recording API traffic to %s", task_name, record_path)
+    profiler = PhaseProfiler(_task_output_path(args.profile, task_name, multi), logger)
+    run_seconds = args.run_deadline
+    if args.watch:
+        run_seconds = args.watch * 3600 + HOLD_DEADLINE + CHECKOUT_DEADLINE
+    run = Deadline(run_seconds, "run")
+    lag_monitor: Optional[LoopLagMonitor] = None
+    checkout_tab: Optional[CheckoutPreloader] = None
+
+    def _held(_tee: TeeTime) -> None:
+        if on_stage is not None:
+            on_stage(task_name, "hold")
+
+    async with async_playwright() as p:
+        browser = await open_browser(p, is_headless, args.cdp_endpoint)
+        context = await browser.new_context()
+        page = await context.new_page()
+
+        try:
+            if profiler.enabled:
+                lag_monitor = LoopLagMonitor(logger)
+                lag_monitor.start()
+            logger.info("[%s] Authenticating as %s...", task_name, login_uid)
+            with profiler.phase("login"):
+                login_session, cart_session = await do_login_and_get_sessions(
+                    page, ENDPOINTS["login"], login_uid, login_pwd
+                )
+            logger.info(
+                "[%s] Acquired login session: %s...%s",
+                task_name,
+                login_session[:10],
+                login_session[-10:],
+            )
+            logger.info("[%s] Acquired cart session: %s", task_name, cart_session)
+            if not args.dry_run:
+                checkout_tab = CheckoutPreloader(context, task_name)
+                checkout_tab.start()
+
+            tasks_dict = get_task_schedule_entries(config, task_name)
+            logger.info("[%s] Loaded %s scheduled tasks", task_name, len(tasks_dict))
+
+            async with (
+                create_client(recorder) as client,
+                LeaseManager(client, login_session, logger, on_acquire=_held) as leases,
+            ):
+                with profiler.phase("prefetch"), use_deadline(run):
+                    metadata = get_metadata_store()
+                    codes = get_task_facility_codes(config, tasks_dict)
+                    await metadata.prefetch(client, codes, logger)
+                    warm_body_templates(metadata.rates.values())
+                if args.watch:
+                    targets = build_watch_targets(
+                        client,
+                        config,
+                        task_name,
+                        tasks_dict,
+                        cart_session,
+                        login_session,
+                        logger,
+                        leases=leases,
+                    )
+                    with (
+                        profiler.phase("watch"),
+                        use_deadline(run.child(args.watch * 3600, "watch")),
+                    ):
+                        found = bool(
+                            await watch_for_cancellations(targets, args.watch, logger, task_name)
+                        )
+                else:
+                    # Keep enough of the run for holding and checking out what is found.
+                    search_seconds = min(
+                        args.deadline, run.remaining() - HOLD_DEADLINE - CHECKOUT_DEADLINE
+                    )
+                    if search_seconds <= 0:
+                        logger.info(
+                            "[%s] No search time left: %.1fs of --run-deadline remain after "
+                            "login, %gs are kept for hold and checkout.",
+                            task_name,
+                            run.remaining(),
+                            HOLD_DEADLINE + CHECKOUT_DEADLINE,
+                        )
+                    search = run.child(search_seconds, "search")
+                    with profiler.phase("search"), use_deadline(search):
+                        found = await _run_schedules_async(
+                            client,
+                            config,
+                            task_name,
+                            tasks_dict,
+                            cart_session,
+                            login_session,
+                            logger,
+                            leases=leases,
+                            deadline=search.remaining(),
+                            after_first=args.after_first,
+                        )
+
+                if found:
+                    if not args.dry_run:
+                        # Leases keep refreshing in the background while the UI checks out.
+                        logger.info("[%s] Executing checkout sequence...", task_name)
+                        if on_stage is not None:
+                            on_stage(task_name, "checkout")
+                        checkout = run.child(CHECKOUT_DEADLINE, "checkout")
+                        with profiler.phase("checkout"):
+                            await asyncio.wait_for(
+                                checkout_tab.checkout(page, task_name),
+                                checkout.remaining(),
+                            )
+                            await leases.complete()
+                        logger.info("[%s] Checkout sequence completed successfully.", task_name)
+                        await asyncio.sleep(TIMEOUT)
+                    else:
+                        logger.info("[%s] --dry-run active. Skipping actual checkout.", task_name)
+                else:
+                    logger.info("[%s] No tee times locked. Skipping checkout.", task_name)
+
+        except Exception:
+            traceback_msg = f"Traceback: {traceback.format_exc()}"
+            _log_traceback(logger, traceback_msg)
+        finally:
+            if checkout_tab is not None:
+                await checkout_tab.close()
+            if lag_monitor is not None:
+                await lag_monitor.stop()
+            summary = profiler.write_summary()
+            if summary:
+                logger.info("[%s] Profile written to %s", task_name, summary.parent)
+            if recorder:
+                recorder.close()
+            await context.close()
+            await browser.close()
+            logger.info("[%s] Session closed.", task_name)
+            _log_phase_banner(logger, task_name, start=False)
+    return found
@@ -1,24 +1,48 @@
 """Schedule interpretation, timezone math, and tee-time search loop."""
 
 import asyncio
+import contextlib
 import datetime as dt
 import logging
 import secrets
+import time
 from dataclasses import dataclass
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import httpx
 
 from london_golf.api_client import (
+    SUCCESS,
+    TRANSIENT,
+    classify_response,
     get_tee_times,
+    release_tee_time_lock,
     set_lock_tee_time,
     set_shopping_cart,
 )
-from london_golf.cache import CacheManager
+from london_golf.cache import CacheManager, get_cache
 from london_golf.config_loader import AppConfig, TaskScheduleRow
-from london_golf.constants import BOOK_INTERVAL, MAX_WAIT_TEETIME, WEEKDAY
-from london_golf.logging_config import get_logger
+from london_golf.constants import (
+    AFTER_FIRST_BOOKING,
+    AFTER_FIRST_POLICIES,
+    BOOK_INTERVAL,
+    BOOK_RETRIES,
+    BOOK_RETRY_BACKOFF,
+    HOLD_DEADLINE,
+    MAX_CONCURRENT_SEARCHES,
+    MAX_WAIT_TEETIME,
+    POLL_INTERVAL,
+    PRE_BURST_INTERVAL,
+    SEARCH_DEADLINE,
+    SHEET_SHARE_TTL,
+    WEEKDAY,
+)
+from london_golf.deadline import Deadline, current_deadline, use_deadline
+from london_golf.history import HistoryStore, ReleasePlan, get_history_store, get_release_model
+from london_golf.lease import LeaseManager
+from london_golf.logging_config import get_logger, sampled
+from london_golf.models import TEE_TIME_FORMAT, Candidate, TeeTime
 
 
 def convert_tz(input_dt: Any, tz1: str, tz2: str) -> dt.datetime:
@@ -42,13 +66,94 @@ def convert_tz_utc_to_utc(input_dt: Any) -> dt.datetime:
     return convert_tz(input_dt, "UTC", "UTC")
 
 
+def _default_book_date() -> str:
+    """Return the release-window date (today + BOOK_INTERVAL)."""
+    return (dt.datetime.now() + dt.timedelta(days=BOOK_INTERVAL)).strftime("%Y-%m-%d")
+
+
 def _resolve_book_date(schedule_info: TaskScheduleRow) -> str:
-    """Return explicit book_date or default (today + BOOK_INTERVAL)."""
+    """Return the first explicit book_date or default (today + BOOK_INTERVAL)."""
     if schedule_info.book_date:
-        if isinstance(schedule_info.book_date, dt.date):
-            return schedule_info.book_date.strftime("%Y-%m-%d")
-        return str(schedule_info.book_date)
-    return (dt.datetime.now() + dt.timedelta(days=BOOK_INTERVAL)).strftime("%Y-%m-%d")
+        return schedule_info.book_date[0]
+    return _default_book_date()
+
+
+def resolve_book_dates(schedule_info: TaskScheduleRow, worker_id: str) -> List[str]:
+    """Return the dates this weekday row should search.
+
+    Explicit dates are kept only when they fall on ``worker_id``; rows inherited by
+    several weekdays therefore split a shared range without searching a date twice.
+    """
+    if not schedule_info.book_date:
+        return [_default_book_date()]
+    return [
+        day
+        for day in schedule_info.book_date
+        if WEEKDAY[dt.date.fromisoformat(day).weekday()] == worker_id
+    ]
+
+
+class SearchControl:
+    """Run-wide stop switch shared by the quotas of concurrently searched rows.
+
+    Once stopped, no quota grants new claims; :meth:`idle` waits until every lock+cart
+    sequence already under way has settled, so searches can be cancelled safely.
+    """
+
+    def __init__(self) -> None:
+        self.stopped = False
+        self.in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def stop(self) -> None:
+        self.stopped = True
+
+    def _claimed(self) -> None:
+        self.in_flight += 1
+        self._idle.clear()
+
+    def _settled(self) -> None:
+        self.in_flight -= 1
+        if self.in_flight == 0:
+            self._idle.set()
+
+    async def idle(self) -> None:
+        await self._idle.wait()
+
+
+class BookingQuota:
+    """Slots still to book across concurrent searches sharing one schedule row.
+
+    A search must ``claim`` before lock+cart and ``settle`` afterwards, so the runner
+    only cancels its siblings once every claimed slot has finished its sequence.
+    """
+
+    def __init__(self, total: int, control: Optional[SearchControl] = None) -> None:
+        self.remaining = total
+        self.in_flight = 0
+        self.control = control
+
+    def claim(self) -> bool:
+        if self.remaining <= 0 or (self.control is not None and self.control.stopped):
+            return False
+        self.remaining -= 1
+        self.in_flight += 1
+        if self.control is not None:
+            self.control._claimed()  # pylint: disable=protected-access
+        return True
+
+    def settle(self, booked: bool = True) -> None:
+        """Finish a claim; a failed lock+cart gives its slot back to the quota."""
+        self.in_flight -= 1
+        if not booked:
+            self.remaining += 1
+        if self.control is not None:
+            self.control._settled()  # pylint: disable=protected-access
+
+    @property
+    def done(self) -> bool:
+        return self.remaining <= 0 and self.in_flight == 0
 
 
 def _apply_time_window(
@@ -62,20 +167,15 @@ def _apply_time_window(
     state["bookEndTimeUtc"] = start_utc + dt.timedelta(minutes=dur_m)
     state["bookStartTimeEastern"] = convert_tz_utc_to_eastern(start_utc)
     state["bookEndTimeEastern"] = convert_tz_utc_to_eastern(state["bookEndTimeUtc"])
+    state["bookStartTeetime"] = start_utc.strftime(TEE_TIME_FORMAT)
+    state["bookEndTeetime"] = state["bookEndTimeUtc"].strftime(TEE_TIME_FORMAT)
 
 
-def _pick_course_fields(
-    schedule_info: TaskScheduleRow, config: AppConfig, state: Dict[str, Any]
-) -> None:
-    """Choose a random course and attach code/name from config."""
-    courses = (
-        [schedule_info.course] if isinstance(schedule_info.course, str) else schedule_info.course
-    )
-    picked = secrets.choice(courses)
-    state["picked_course"] = picked
-    course_cfg = config.course[picked]
-    state["courseCode"] = course_cfg.code
-    state["courseName"] = course_cfg.name
+def booking_window(book_date: str, start_time: str, minutes: int) -> Tuple[str, str]:
+    """First and last tee-time strings (UTC) of ``minutes`` from ``start_time`` Eastern."""
+    start_utc = convert_tz_eastern_to_utc(f"{book_date} {start_time}:00")
+    end_utc = start_utc + dt.timedelta(minutes=minutes)
+    return start_utc.strftime(TEE_TIME_FORMAT), end_utc.strftime(TEE_TIME_FORMAT)
 
 
 def _log_schedule_dump(
@@ -121,7 +221,29 @@ def _log_tee_scan_outcome(
 
 
 @dataclass(frozen=True)
-class _TeeSearchContext:
+class PollStrategy:
+    """Release-window polling cadence: seconds between polls and the attempt budget."""
+
+    poll_interval: float = POLL_INTERVAL
+    max_attempts: int = MAX_WAIT_TEETIME
+
+
+@dataclass(frozen=True)
+class BookingSession:
+    """What one lock+cart sequence needs; ``label`` prefixes its log lines."""
+
+    client: httpx.AsyncClient
+    login_session: str
+    cart_session: str
+    log: logging.Logger
+    leases: Optional[LeaseManager] = None
+    label: str = ""
+
+
+@dataclass(frozen=True)
+class TeeSearchContext:
+    """One (course, date) search of a schedule row; build it with :func:`search_context`."""
+
     client: httpx.AsyncClient
     schedule_info: TaskScheduleRow
     state: Dict[str, Any]
@@ -132,145 +254,396 @@ class _TeeSearchContext:
     login_session: str
     log: logging.Logger
     cache: CacheManager
+    quota: BookingQuota
+    leases: Optional[LeaseManager] = None
+    strategy: PollStrategy = PollStrategy()
+    history: Optional[HistoryStore] = None
+
+    @property
+    def window(self) -> Tuple[str, str]:
+        return self.state["bookStartTeetime"], self.state["bookEndTeetime"]
+
+    @property
+    def session(self) -> BookingSession:
+        return BookingSession(
+            client=self.client,
+            login_session=self.login_session,
+            cart_session=self.cart_session,
+            log=self.log,
+            leases=self.leases,
+            label=self.task_column.strip(),
+        )
+
+
+def search_context(
+    client: httpx.AsyncClient,
+    schedule_info: TaskScheduleRow,
+    config: AppConfig,
+    course: str,
+    book_date: str,
+    *,
+    task_name: str,
+    worker_id: str,
+    cart_session: str,
+    login_session: str,
+    log: logging.Logger,
+    cache: CacheManager,
+    quota: Optional[BookingQuota] = None,
+    leases: Optional[LeaseManager] = None,
+    strategy: Optional[PollStrategy] = None,
+    history: Optional[HistoryStore] = None,
+) -> TeeSearchContext:
+    """Resolve ``schedule_info``'s window, ``course`` and a random slot offset for ``book_date``."""
+    state: Dict[str, Any] = {}
+    _apply_time_window(schedule_info, book_date, state)
+    course_cfg = config.course[course]
+    state["picked_course"] = course
+    state["courseCode"] = course_cfg.code
+    state["courseName"] = course_cfg.name
+    state["slot_offset"] = secrets.randbelow(schedule_info.slot + 1)
+    return TeeSearchContext(
+        client=client,
+        schedule_info=schedule_info,
+        state=state,
+        task_column=f"{task_name:<10}",
+        worker_id=worker_id,
+        book_date=book_date,
+        cart_session=cart_session,
+        login_session=login_session,
+        log=log,
+        cache=cache,
+        quota=quota or BookingQuota(schedule_info.book_count),
+        leases=leases,
+        strategy=strategy or PollStrategy(),
+        history=history,
+    )
+
+
+async def _call_with_retry(
+    session: BookingSession,
+    label: str,
+    east_hm: str,
+    call: Callable[[], Awaitable[httpx.Response]],
+) -> Tuple[str, Optional[httpx.Response]]:
+    """Run a lock/cart call, retrying transient failures up to ``BOOK_RETRIES`` times.
+
+    Retries stop early once the active (hold) deadline has run out.
+    """
+    deadline = current_deadline()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            response: Optional[httpx.Response] = await call()
+            detail = f"HTTP {response.status_code}"
+        except httpx.HTTPError as exc:
+            response, detail = None, repr(exc)
+        outcome = classify_response(response)
+        if outcome != TRANSIENT or attempt > BOOK_RETRIES:
+            return outcome, response
+        if deadline is not None and deadline.remaining() < BOOK_RETRY_BACKOFF * attempt:
+            return outcome, response
+        session.log.info(
+            "[%s] %s %s failed (%s); retry %s/%s",
+            session.label,
+            label,
+            east_hm,
+            detail,
+            attempt,
+            BOOK_RETRIES,
+        )
+        await asyncio.sleep(BOOK_RETRY_BACKOFF * attempt)
+
+
+async def _lock_and_cart(session: BookingSession, tee_time: TeeTime, east_hm: str) -> str:
+    def _lock() -> Awaitable[httpx.Response]:
+        if session.leases is not None:
+            return session.leases.acquire(tee_time)
+        return set_lock_tee_time(session.client, session.login_session, tee_time, session.log)
+
+    lock_outcome, lock_res = await _call_with_retry(session, "Lock", east_hm, _lock)
+    if lock_outcome != SUCCESS:
+        _log_sequence(session, east_hm, lock_outcome, lock_res, None)
+        return lock_outcome
+
+    cart_outcome, cart_res = await _call_with_retry(
+        session,
+        "Cart",
+        east_hm,
+        lambda: set_shopping_cart(session.client, session.cart_session, tee_time, session.log),
+    )
+    _log_sequence(session, east_hm, cart_outcome, lock_res, cart_res)
+    if cart_outcome != SUCCESS:
+        # The slot cannot be checked out; give the lock back instead of holding it.
+        with contextlib.suppress(httpx.HTTPError):
+            if session.leases is not None:
+                await session.leases.release(tee_time)
+            else:
+                await release_tee_time_lock(
+                    session.client, session.login_session, tee_time, session.log
+                )
+    return cart_outcome
+
+
+def _log_sequence(
+    session: BookingSession,
+    east_hm: str,
+    outcome: str,
+    lock_res: Optional[httpx.Response],
+    cart_res: Optional[httpx.Response],
+) -> None:
+    session.log.info(
+        "[%s] Sequence %s for %s. Lock: %s | Cart: %s",
+        session.label,
+        outcome.upper(),
+        east_hm,
+        f"HTTP {lock_res.status_code}" if lock_res is not None else "error",
+        f"HTTP {cart_res.status_code}" if cart_res is not None else "-",
+    )
+
+
+def _hold_deadline() -> Deadline:
+    """``HOLD_DEADLINE`` for one lock+cart sequence, within the run (root) deadline.
+
+    The hold budget comes from the run deadline, not the search phase: a sequence
+    started just before the search deadline still gets its full time to finish.
+    """
+    parent = current_deadline()
+    if parent is not None:
+        return parent.root.child(HOLD_DEADLINE, "hold")
+    return Deadline(HOLD_DEADLINE, "hold")
+
+
+async def lock_and_cart(session: BookingSession, tee_time: TeeTime, east_hm: str) -> str:
+    """Lock ``tee_time`` and add it to the cart; returns SUCCESS, CONTENDED or TRANSIENT.
+
+    The sequence runs under :func:`_hold_deadline`, retrying transient failures. A
+    slot that locks but cannot be carted is released again.
+    """
+    with use_deadline(_hold_deadline()):
+        return await _lock_and_cart(session, tee_time, east_hm)
 
 
 async def _process_tee_candidate(
-    ctx: _TeeSearchContext,
-    t_ctx: Dict[str, Any],
-    selected: List[Dict[str, Any]],
-) -> bool:
-    tee_time_info = t_ctx["raw"]
-    eastern = t_ctx["eastern"]
-    east_hm = t_ctx["east_hm"]
-    validation_key = t_ctx["validation_key"]
+    ctx: TeeSearchContext,
+    candidate: Candidate,
+    selected: List[TeeTime],
+) -> str:
+    """Lock and cart one candidate; returns SUCCESS, CONTENDED or TRANSIENT."""
+    tee_time = candidate.tee
+    east_hm = candidate.east_hm
     picked = ctx.state["picked_course"]
     task = ctx.task_column.strip()
 
-    ctx.state["teeTimeEastern"] = eastern.strftime("%Y-%m-%d %H:%M")
-    tee_time_info["scheduleInfo"] = ctx.state
-    selected.append(tee_time_info)
-    ctx.cache.set(validation_key, "OK", 300)
+    # Cached whatever the outcome: a lost or failing slot is not retried on the next poll.
+    ctx.cache.set(candidate.validation_key, "OK", 300)
 
     ctx.log.info("[%s]   - %s (%s) : >>> SELECTED! <<<", task, east_hm, picked)
     ctx.log.info("[%s] Executing lock+cart sequence for %s...", task, east_hm)
-    lock_res = await set_lock_tee_time(ctx.client, ctx.login_session, tee_time_info, ctx.log)
-    cart_res = await set_shopping_cart(ctx.client, ctx.cart_session, tee_time_info, ctx.log)
+    outcome = TRANSIENT
+    try:
+        outcome = await lock_and_cart(ctx.session, tee_time, east_hm)
+    finally:
+        ctx.quota.settle(booked=outcome == SUCCESS)
 
-    ctx.log.info(
-        "[%s] Sequence complete. Lock: HTTP %s | Cart: HTTP %s",
-        task,
-        lock_res.status_code,
-        cart_res.status_code,
-    )
-    return True
+    if outcome == SUCCESS:
+        selected.append(tee_time)
+    return outcome
 
 
-async def _search_tee_times(ctx: _TeeSearchContext) -> List[Dict[str, Any]]:
-    flag_tee_time = True
-    idx = 0
-    selected: List[Dict[str, Any]] = []
+def window_candidates(
+    tee_times: List[TeeTime],
+    window: Tuple[str, str],
+    cache: Optional[CacheManager] = None,
+) -> List[Candidate]:
+    """Tee times inside ``window`` (see :func:`booking_window`), tagged with their cache state.
 
-    while flag_tee_time and idx < MAX_WAIT_TEETIME:
-        idx += 1
-        code = str(ctx.state["courseCode"])
-        tee_times = await get_tee_times(ctx.client, code, ctx.book_date, ctx.log)
+    Without ``cache`` no candidate counts as already tried.
+    """
+    # Fixed-width UTC strings sort chronologically: filter without parsing every row.
+    start_key, end_key = window
 
-        if not tee_times:
-            if idx == 1 or idx % 10 == 0:
-                ctx.log.info(
-                    "[%s] Polling API (Attempt %s/%s) - No records found yet",
-                    ctx.task_column.strip(),
-                    idx,
-                    MAX_WAIT_TEETIME,
-                )
-        else:
-            start_u = ctx.state["bookStartTimeUtc"]
-            end_u = ctx.state["bookEndTimeUtc"]
-
-            valid_candidates = []
-
-            for t in tee_times:
-                parsed = dt.datetime.strptime(t["teetime"], "%Y-%m-%dT%H:%M:%S.000Z")
-                tee_time = convert_tz_utc_to_utc(parsed.strftime("%Y-%m-%d %H:%M:%S"))
-
-                if not (start_u <= tee_time <= end_u):
-                    continue
-
-                eastern = convert_tz_utc_to_eastern(tee_time)
-                east_hm = eastern.strftime("%H:%M")
-
-                rate_id = t["rates"][0]["_id"]
-                east_key = eastern.strftime("%Y-%m-%d %H:%M:%S")
-                validation_key = f"{rate_id}:{east_key}"
-                cached = ctx.cache.get(validation_key)
-
-                valid_candidates.append(
-                    {
-                        "raw": t,
-                        "eastern": eastern,
-                        "east_hm": east_hm,
-                        "validation_key": validation_key,
-                        "cached": cached,
-                    }
-                )
+    valid_candidates = []
+
+    for tee in tee_times:
+        if not (start_key <= tee.teetime <= end_key):
+            continue
+
+        parsed = dt.datetime.strptime(tee.teetime, TEE_TIME_FORMAT)
+        eastern = convert_tz_utc_to_eastern(parsed)
 
+        east_key = eastern.strftime("%Y-%m-%d %H:%M:%S")
+        validation_key = f"{tee.rate_key}:{east_key}"
+        cached = cache is not None and bool(cache.get(validation_key))
+
+        valid_candidates.append(Candidate(tee, eastern, validation_key, cached))
+    return valid_candidates
+
+
+def _log_candidates(ctx: TeeSearchContext, valid_candidates: List[Candidate]) -> None:
+    for c in valid_candidates:
+        if c.cached:
+            ctx.log.info(
+                "[%s]   - %s (%s) : Cached (Skipping)",
+                ctx.task_column.strip(),
+                c.east_hm,
+                ctx.state["picked_course"],
+                extra=sampled("tee_candidate"),
+            )
+        else:
             ctx.log.info(
-                "[%s] Polling API (Attempt %s/%s) - Discovered %s tee times in time window.",
+                "[%s]   - %s (%s) : Available",
                 ctx.task_column.strip(),
-                idx,
-                MAX_WAIT_TEETIME,
-                len(valid_candidates),
+                c.east_hm,
+                ctx.state["picked_course"],
+                extra=sampled("tee_candidate"),
             )
 
-            for c in valid_candidates:
-                if c["cached"]:
-                    ctx.log.info(
-                        "[%s]   - %s (%s) : Cached (Skipping)",
-                        ctx.task_column.strip(),
-                        c["east_hm"],
-                        ctx.state["picked_course"],
-                    )
-                else:
-                    ctx.log.info(
-                        "[%s]   - %s (%s) : Available",
-                        ctx.task_column.strip(),
-                        c["east_hm"],
-                        ctx.state["picked_course"],
-                    )
 
-            fresh_candidates = [c for c in valid_candidates if not c["cached"]]
+async def _book_fresh_candidates(
+    ctx: TeeSearchContext,
+    fresh_candidates: List[Candidate],
+    selected: List[TeeTime],
+) -> bool:
+    """Lock+cart up to ``book_count`` consecutive fresh slots; True if any was booked."""
+    book_count = min(ctx.schedule_info.book_count, ctx.quota.remaining)
+    slot = ctx.state["slot_offset"]
 
-            if fresh_candidates:
-                book_count = ctx.schedule_info.book_count
-                slot = ctx.state["slot_offset"]
+    max_start_idx = max(0, len(fresh_candidates) - book_count)
+    actual_start_idx = min(slot, max_start_idx)
 
-                max_start_idx = max(0, len(fresh_candidates) - book_count)
-                actual_start_idx = min(slot, max_start_idx)
+    # Preferred slots first; the rest of the same sheet is the failover order.
+    ordered = fresh_candidates[actual_start_idx:] + fresh_candidates[:actual_start_idx]
 
-                targets = fresh_candidates[actual_start_idx : actual_start_idx + book_count]
+    ctx.log.info(
+        "[%s] Targeting %s consecutive slots starting from index %s (Random slot was %s).",
+        ctx.task_column.strip(),
+        book_count,
+        actual_start_idx,
+        slot,
+    )
 
-                ctx.log.info(
-                    "[%s] Targeting %s consecutive slots starting from index %s (Random slot was %s).",
-                    ctx.task_column.strip(),
-                    len(targets),
-                    actual_start_idx,
-                    slot,
-                )
+    booked = False
+    for candidate in ordered:
+        if not ctx.quota.claim():
+            break
+        outcome = await _process_tee_candidate(ctx, candidate, selected)
+        if outcome == SUCCESS:
+            booked = True
+        else:
+            ctx.log.info(
+                "[%s]   - %s : %s, failing over to the next candidate",
+                ctx.task_column.strip(),
+                candidate.east_hm,
+                outcome,
+            )
+
+    _log_tee_scan_outcome(
+        ctx.log,
+        ctx.task_column,
+        ctx.worker_id,
+        ctx.state["picked_course"],
+        booked,
+    )
+    return booked
 
-                for t_ctx in targets:
-                    if await _process_tee_candidate(ctx, t_ctx, selected):
-                        flag_tee_time = False
 
-                _log_tee_scan_outcome(
-                    ctx.log,
-                    ctx.task_column,
-                    ctx.worker_id,
-                    ctx.state["picked_course"],
-                    not flag_tee_time,
+async def book_candidates(
+    ctx: TeeSearchContext,
+    candidates: List[Candidate],
+    selected: List[TeeTime],
+) -> bool:
+    """Log ``candidates`` and lock+cart the fresh ones within the quota; True if any was booked.
+
+    Booked tee times are appended to ``selected``.
+    """
+    _log_candidates(ctx, candidates)
+    fresh_candidates = [c for c in candidates if not c.cached]
+    if not fresh_candidates or ctx.quota.remaining <= 0:
+        return False
+    return await _book_fresh_candidates(ctx, fresh_candidates, selected)
+
+
+def _release_plan(ctx: TeeSearchContext, code: str) -> Optional[ReleasePlan]:
+    if ctx.history is None:
+        return None
+    plan = get_release_model(ctx.history).plan(code)
+    if plan is not None:
+        ctx.log.info(
+            "[%s] Release predicted at %s (%s past releases); burst polling every %ss from %s",
+            ctx.task_column.strip(),
+            dt.datetime.fromtimestamp(plan.release_at).strftime("%H:%M:%S"),
+            plan.samples,
+            plan.interval,
+            dt.datetime.fromtimestamp(plan.start).strftime("%H:%M:%S"),
+        )
+    return plan
+
+
+def _next_poll(ctx: TeeSearchContext, plan: Optional[ReleasePlan]) -> Tuple[float, bool]:
+    """Seconds to the next poll, and whether that poll counts against ``max_attempts``."""
+    if plan is None:
+        return ctx.strategy.poll_interval, True
+    now = time.time()
+    if now < plan.start:
+        # Before the burst: an occasional check in case the release comes early.
+        return min(PRE_BURST_INTERVAL, plan.start - now), False
+    if plan.in_burst(now):
+        return plan.interval, False
+    return ctx.strategy.poll_interval, True
+
+
+async def _search_tee_times(ctx: TeeSearchContext) -> List[TeeTime]:
+    flag_tee_time = True
+    idx = 0
+    counted = 0
+    selected: List[TeeTime] = []
+
+    max_attempts = ctx.strategy.max_attempts
+    code = str(ctx.state["courseCode"])
+    plan = _release_plan(ctx, code)
+    # A shared sheet may be reused only if it is newer than this search's own last poll.
+    max_age = min(SHEET_SHARE_TTL, ctx.strategy.poll_interval / 2)
+    try:
+        while flag_tee_time and counted < max_attempts:
+            idx += 1
+            tee_times = await get_tee_times(
+                ctx.client, code, ctx.book_date, ctx.log, max_age=max_age
+            )
+            if tee_times is None:
+                # Failed poll (already logged): not an empty sheet, so not history.
+                tee_times = []
+            elif ctx.history is not None:
+                ctx.history.record(code, ctx.book_date, len(tee_times))
+            delay, counts = _next_poll(ctx, plan)
+            counted += counts
+
+            if not tee_times:
+                if idx == 1 or idx % 10 == 0:
+                    ctx.log.info(
+                        "[%s] Polling API (Attempt %s/%s) - No records found yet",
+                        ctx.task_column.strip(),
+                        counted,
+                        max_attempts,
+                    )
+            else:
+                valid_candidates = window_candidates(tee_times, ctx.window, ctx.cache)
+
+                ctx.log.info(
+                    "[%s] Polling API (Attempt %s/%s) - Discovered %s tee times in time window.",
+                    ctx.task_column.strip(),
+                    counted,
+                    max_attempts,
+                    len(valid_candidates),
                 )
-                break
+                if await book_candidates(ctx, valid_candidates, selected):
+                    flag_tee_time = False
+                    break
 
-        await asyncio.sleep(1)
+            await asyncio.sleep(delay)
+    finally:
+        if ctx.history is not None:
+            ctx.history.flush(ctx.log)
 
     ctx.log.info(
         "[%s] Search completed. Iterations: %s, Selected: %s",
@@ -289,36 +662,230 @@ async def get_book_schedule(
     login_session: str,
     config: AppConfig,
     worker_id: str,
-) -> List[Dict[str, Any]]:
-    """One schedule: weekday filter, API search, lock/cart on match."""
+    book_date: Optional[str] = None,
+    quota: Optional[BookingQuota] = None,
+    leases: Optional[LeaseManager] = None,
+    strategy: Optional[PollStrategy] = None,
+    cache: Optional[CacheManager] = None,
+    history: Optional[HistoryStore] = None,
+) -> List[TeeTime]:
+    """One schedule: weekday filter, API search, lock/cart on match.
+
+    With ``history``, every polled sheet is recorded and a predicted release time
+    (see :mod:`london_golf.history`) paces the polling.
+    """
     log = get_logger()
     task = task_name.strip()
     log.info("[%s] Initializing search for %s", task, worker_id)
-    cache = CacheManager(config.model_dump(), log)
-    book_date = _resolve_book_date(schedule_info)
-
-    state: Dict[str, Any] = {}
-    _apply_time_window(schedule_info, book_date, state)
-
-    task_column = f"{task_name:<10}"
-    if not _weekday_allowed(task_column, worker_id, state, log):
-        return []
-
-    _pick_course_fields(schedule_info, config, state)
-    state["slot_offset"] = secrets.randbelow(schedule_info.slot + 1)
-
-    _log_schedule_dump(task_column, worker_id, state, log)
+    cache = cache or get_cache(config, log)
+    book_date = book_date or _resolve_book_date(schedule_info)
 
-    search_ctx = _TeeSearchContext(
-        client=client,
-        schedule_info=schedule_info,
-        state=state,
-        task_column=task_column,
+    courses = (
+        [schedule_info.course] if isinstance(schedule_info.course, str) else schedule_info.course
+    )
+    search_ctx = search_context(
+        client,
+        schedule_info,
+        config,
+        secrets.choice(courses),
+        book_date,
+        task_name=task_name,
         worker_id=worker_id,
-        book_date=book_date,
         cart_session=cart_session,
         login_session=login_session,
         log=log,
         cache=cache,
+        quota=quota,
+        leases=leases,
+        strategy=strategy,
+        history=history,
     )
+    if not _weekday_allowed(search_ctx.task_column, worker_id, search_ctx.state, log):
+        return []
+
+    _log_schedule_dump(search_ctx.task_column, worker_id, search_ctx.state, log)
+
     return await _search_tee_times(search_ctx)
+
+
+async def search_book_dates(
+    client: httpx.AsyncClient,
+    schedule_info: TaskScheduleRow,
+    task_name: str,
+    cart_session: str,
+    login_session: str,
+    config: AppConfig,
+    worker_ids: List[str],
+    max_concurrency: int = MAX_CONCURRENT_SEARCHES,
+    leases: Optional[LeaseManager] = None,
+    control: Optional[SearchControl] = None,
+) -> List[TeeTime]:
+    """Search every date of one row concurrently; stop after ``book_count`` wins.
+
+    ``worker_ids`` lists the weekday keys sharing this row (inherited weekdays point
+    at the same row object), so a date range is searched once across all of them.
+    ``control`` ties the row's quota to a multi-row run (see :func:`search_schedule_rows`).
+    """
+    log = get_logger()
+    jobs = sorted(
+        (day, worker_id)
+        for worker_id in worker_ids
+        for day in resolve_book_dates(schedule_info, worker_id)
+    )
+    label = ",".join(worker_ids)
+    if not jobs:
+        log.info("[%s] [%s] No target dates fall on these weekdays.", task_name, label)
+        return []
+    quota = BookingQuota(schedule_info.book_count, control)
+    history = get_history_store()
+    if len(jobs) == 1:
+        day, worker_id = jobs[0]
+        return await get_book_schedule(
+            client,
+            schedule_info,
+            task_name,
+            cart_session,
+            login_session,
+            config,
+            worker_id,
+            book_date=day,
+            quota=quota,
+            leases=leases,
+            history=history,
+        )
+
+    log.info(
+        "[%s] [%s] Searching %s dates (%s..%s), up to %s at a time",
+        task_name,
+        label,
+        len(jobs),
+        jobs[0][0],
+        jobs[-1][0],
+        max_concurrency,
+    )
+    gate = asyncio.Semaphore(max_concurrency)
+
+    async def _one(book_date: str, worker_id: str) -> List[TeeTime]:
+        async with gate:
+            if quota.done:
+                return []
+            return await get_book_schedule(
+                client,
+                schedule_info,
+                task_name,
+                cart_session,
+                login_session,
+                config,
+                worker_id,
+                book_date=book_date,
+                quota=quota,
+                leases=leases,
+                history=history,
+            )
+
+    pending = {asyncio.create_task(_one(day, wid), name=f"search-{day}") for day, wid in jobs}
+    selected: List[TeeTime] = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                selected.extend(task.result())
+            if quota.done:
+                log.info(
+                    "[%s] [%s] Booked %s slot(s); cancelling %s remaining date searches",
+                    task_name,
+                    label,
+                    len(selected),
+                    len(pending),
+                )
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return selected
+
+
+async def search_schedule_rows(
+    client: httpx.AsyncClient,
+    rows: List[Tuple[TaskScheduleRow, List[str]]],
+    task_name: str,
+    cart_session: str,
+    login_session: str,
+    config: AppConfig,
+    deadline: float = SEARCH_DEADLINE,
+    after_first: str = AFTER_FIRST_BOOKING,
+    leases: Optional[LeaseManager] = None,
+) -> List[TeeTime]:
+    """Search several schedule rows at once, each as in :func:`search_book_dates`.
+
+    ``rows`` pairs each row with the weekday keys sharing it. Every row starts polling
+    immediately. With ``after_first="stop"`` the first row to book ends the run; with
+    ``"continue"`` the other rows keep going. After ``deadline`` seconds the run stops
+    either way. Stopping never interrupts a lock+cart sequence that has started.
+    """
+    if after_first not in AFTER_FIRST_POLICIES:
+        raise ValueError(f"after_first must be one of {AFTER_FIRST_POLICIES}, got {after_first!r}")
+    log = get_logger()
+    control = SearchControl()
+    pending = {
+        asyncio.create_task(
+            search_book_dates(
+                client,
+                row,
+                task_name,
+                cart_session,
+                login_session,
+                config,
+                weekdays,
+                leases=leases,
+                control=control,
+            ),
+            name=f"row-{','.join(weekdays)}",
+        )
+        for row, weekdays in rows
+    }
+    log.info(
+        "[%s] Searching %s schedule rows concurrently (deadline %.0fs, after first booking: %s)",
+        task_name,
+        len(pending),
+        deadline,
+        after_first,
+    )
+    loop = asyncio.get_running_loop()
+    stop_at = loop.time() + deadline
+    selected: List[TeeTime] = []
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, stop_at - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                selected.extend(task.result())
+            if not done:
+                log.info(
+                    "[%s] Deadline of %.0fs reached; stopping %s row searches",
+                    task_name,
+                    deadline,
+                    len(pending),
+                )
+                break
+            if selected and after_first == "stop":
+                log.info(
+                    "[%s] Booked %s slot(s); stopping %s remaining row searches",
+                    task_name,
+                    len(selected),
+                    len(pending),
+                )
+                break
+    finally:
+        control.stop()
+        if pending:
+            # Let claimed lock+cart sequences finish before cancelling their rows.
+            await control.idle()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    return selected
@@ -0,0 +1,327 @@
+"""Offline release-morning simulator on a virtual event-loop clock.
+
+Runs the real :func:`get_book_schedule` against a synthetic Kenna tee sheet: the release
+time jitters around the nominal opening, competing bookers grab slots after a reaction
+delay, and every request pays a sampled latency. :class:`VirtualClockLoop` jumps straight
+to the next timer instead of sleeping, so thousands of mornings finish in seconds::
+
+    python -m london_golf.simulator --mornings 2000 --interval 0.5 1 2 --start -10 -2
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import itertools
+import json
+import logging
+import random
+import selectors
+import statistics
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+from london_golf.cache import CacheManager
+from london_golf.config_loader import AppConfig, TaskScheduleRow
+from london_golf.constants import MAX_WAIT_TEETIME, POLL_INTERVAL, WEEKDAY
+from london_golf.models import TEE_TIME_FORMAT
+from london_golf.schedule import PollStrategy, convert_tz_eastern_to_utc, get_book_schedule
+
+_SIM_COURSE = "SIM"
+_SIM_CODE = 9999
+
+
+class _VirtualClockSelector(selectors.SelectSelector):
+    """Never blocks: a wait for ``timeout`` seconds advances the loop's clock instead."""
+
+    def __init__(self, loop: "VirtualClockLoop") -> None:
+        super().__init__()
+        self._loop = loop
+
+    def select(self, timeout: Optional[float] = None):
+        ready = super().select(0)
+        if ready:
+            return ready
+        if timeout is None:
+            raise RuntimeError("virtual clock stalled: nothing scheduled and no I/O ready")
+        self._loop.now += max(0.0, timeout)
+        return ready
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):  # pylint: disable=abstract-method
+    """Event loop whose ``time()`` is virtual; idle waits cost no wall-clock time."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        super().__init__(_VirtualClockSelector(self))
+
+    def time(self) -> float:
+        return self.now
+
+
+@dataclass(frozen=True)
+class SheetModel:  # pylint: disable=too-many-instance-attributes
+    """Synthetic tee sheet and market around one release."""
+
+    release_jitter: float = 3.0
+    competitors: int = 6
+    reaction_mean: float = 2.5
+    reaction_sd: float = 1.5
+    latency_mean: float = 0.15
+    latency_sd: float = 0.08
+    first_tee: str = "13:00"
+    last_tee: str = "16:00"
+    tee_interval_minutes: int = 8
+
+
+@dataclass(frozen=True)
+class SimStrategy:
+    """One polling strategy; ``start_offset`` is when polling starts relative to release."""
+
+    poll_interval: float = POLL_INTERVAL
+    max_attempts: int = MAX_WAIT_TEETIME
+    start_offset: float = -5.0
+    slot: int = 0
+
+    @property
+    def label(self) -> str:
+        return (
+            f"interval={self.poll_interval:g}s attempts={self.max_attempts} "
+            f"start={self.start_offset:+g}s slot={self.slot}"
+        )
+
+
+@dataclass
+class MorningResult:
+    hit: bool
+    time_to_lock: Optional[float]
+    requests: int
+
+
+@dataclass
+class StrategyReport:
+    strategy: SimStrategy
+    results: List[MorningResult] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        hits = [r for r in self.results if r.hit]
+        lock_times = sorted(r.time_to_lock for r in hits if r.time_to_lock is not None)
+        return {
+            "mornings": len(self.results),
+            "hit_rate": len(hits) / len(self.results) if self.results else 0.0,
+            "ttl_median": statistics.median(lock_times) if lock_times else float("nan"),
+            "ttl_p90": lock_times[int(0.9 * (len(lock_times) - 1))] if lock_times else float("nan"),
+            "requests_mean": statistics.fmean(r.requests for r in self.results),
+        }
+
+
+class _SimulatedKenna(httpx.AsyncBaseTransport):
+    """Tee-sheet, lock and cart endpoints over the synthetic market."""
+
+    def __init__(
+        self, model: SheetModel, tee_times: List[str], release_at: float, rng: random.Random
+    ) -> None:
+        self._model = model
+        self._rng = rng
+        self._release_at = release_at
+        self._taken: Dict[str, str] = {}
+        self._tee_times = tee_times
+        self._competitor_times = sorted(
+            release_at + max(0.05, rng.gauss(model.reaction_mean, model.reaction_sd))
+            for _ in range(model.competitors)
+        )
+        self.requests = 0
+        self.locked_at: Optional[float] = None
+
+    def _advance(self, now: float) -> None:
+        while self._competitor_times and self._competitor_times[0] <= now:
+            self._competitor_times.pop(0)
+            free = [t for t in self._tee_times if t not in self._taken]
+            if free:
+                self._taken[self._rng.choice(free)] = "competitor"
+
+    def _sheet(self, now: float) -> bytes:
+        if now < self._release_at:
+            return b'[{"teetimes":[]}]'
+        rows = [
+            {
+                "teetime": teetime,
+                "courseId": "sim-course",
+                "bookedPlayers": 4 if teetime in self._taken else 0,
+                "maxPlayers": 4,
+                "rates": [
+                    {
+                        "_id": "sim-rate",
+                        "name": "18 Holes",
+                        "holes": 18,
+                        "greenFeeWalking": 5000,
+                        "allowedPlayers": [1, 2, 3, 4],
+                        "isSimulator": False,
+                        "golfnow": {"GolfFacilityId": _SIM_CODE, "GolfCourseId": 1},
+                    }
+                ],
+            }
+            for teetime in self._tee_times
+        ]
+        return json.dumps([{"teetimes": rows}]).encode()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        latency = max(0.01, self._rng.gauss(self._model.latency_mean, self._model.latency_sd))
+        # Half the latency before the server sees the request, half on the way back.
+        await asyncio.sleep(latency / 2)
+        loop = asyncio.get_running_loop()
+        self._advance(loop.time())
+        if request.method == "GET":
+            response = httpx.Response(200, content=self._sheet(loop.time()), request=request)
+        elif request.method == "PUT":
+            teetime = json.loads(request.content)["teetime"]
+            if teetime in self._taken:
+                response = httpx.Response(409, json={"error": "locked"}, request=request)
+            else:
+                self._taken[teetime] = "us"
+                if self.locked_at is None:
+                    self.locked_at = loop.time()
+                response = httpx.Response(200, json={}, request=request)
+        else:
+            response = httpx.Response(200, json={}, request=request)
+        await asyncio.sleep(latency / 2)
+        return response
+
+
+def _sheet_tee_times(model: SheetModel, book_date: str) -> List[str]:
+    first = dt.datetime.strptime(f"{book_date} {model.first_tee}", "%Y-%m-%d %H:%M")
+    last = dt.datetime.strptime(f"{book_date} {model.last_tee}", "%Y-%m-%d %H:%M")
+    out = []
+    while first <= last:
+        utc = convert_tz_eastern_to_utc(first.strftime("%Y-%m-%d %H:%M:%S"))
+        out.append(utc.strftime(TEE_TIME_FORMAT))
+        first += dt.timedelta(minutes=model.tee_interval_minutes)
+    return out
+
+
+def _sim_config() -> AppConfig:
+    return AppConfig(
+        course={_SIM_COURSE: {"code": _SIM_CODE, "name": "Simulated course"}},
+        authentication={},
+        schedule={},
+    )
+
+
+async def _one_morning(
+    model: SheetModel,
+    strategy: SimStrategy,
+    row: TaskScheduleRow,
+    config: AppConfig,
+    book_date: str,
+    rng: random.Random,
+    log: logging.Logger,
+) -> MorningResult:
+    release_at = -strategy.start_offset + rng.gauss(0.0, model.release_jitter)
+    transport = _SimulatedKenna(model, _sheet_tee_times(model, book_date), release_at, rng)
+    weekday = WEEKDAY[dt.date.fromisoformat(book_date).weekday()]
+    async with httpx.AsyncClient(transport=transport) as client:
+        await get_book_schedule(
+            client,
+            row,
+            "sim",
+            "sim-cart",
+            "sim-session",
+            config,
+            weekday,
+            book_date=book_date,
+            strategy=PollStrategy(strategy.poll_interval, strategy.max_attempts),
+            cache=CacheManager({}, log, cache_file=None),
+        )
+    hit = transport.locked_at is not None
+    return MorningResult(
+        hit=hit,
+        time_to_lock=transport.locked_at - release_at if hit else None,
+        requests=transport.requests,
+    )
+
+
+def simulate(
+    strategies: List[SimStrategy],
+    mornings: int,
+    model: SheetModel = SheetModel(),
+    start_time: str = "14:00",
+    duration: int = 60,
+    seed: int = 0,
+) -> List[StrategyReport]:
+    """Run ``mornings`` simulated releases per strategy; same seeds across strategies."""
+    log = logging.getLogger("london_golf")
+    config = _sim_config()
+    book_date = "2026-06-06"
+    reports = []
+    previous_disabled = log.disabled
+    log.disabled = True
+    try:
+        for strategy in strategies:
+            row = TaskScheduleRow(
+                book_date=book_date,
+                start_time=start_time,
+                duration=duration,
+                slot=strategy.slot,
+                course=[_SIM_COURSE],
+            )
+            report = StrategyReport(strategy)
+            for morning in range(mornings):
+                loop = VirtualClockLoop()
+                try:
+                    report.results.append(
+                        loop.run_until_complete(
+                            _one_morning(
+                                model,
+                                strategy,
+                                row,
+                                config,
+                                book_date,
+                                random.Random(seed + morning),
+                                log,
+                            )
+                        )
+                    )
+                finally:
+                    loop.close()
+            reports.append(report)
+    finally:
+        log.disabled = previous_disabled
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate release mornings per polling strategy")
+    parser.add_argument("--mornings", type=int, default=1000)
+    parser.add_argument("--interval", type=float, nargs="+", default=[POLL_INTERVAL])
+    parser.add_argument("--attempts", type=int, nargs="+", default=[MAX_WAIT_TEETIME])
+    parser.add_argument("--start", type=float, nargs="+", default=[-5.0], help="seconds vs release")
+    parser.add_argument("--slot", type=int, nargs="+", default=[0])
+    parser.add_argument("--competitors", type=int, default=SheetModel.competitors)
+    parser.add_argument("--jitter", type=float, default=SheetModel.release_jitter)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    model = SheetModel(release_jitter=args.jitter, competitors=args.competitors)
+    strategies = [
+        SimStrategy(interval, attempts, start, slot)
+        for interval, attempts, start, slot in itertools.product(
+            args.interval, args.attempts, args.start, args.slot
+        )
+    ]
+    started = time.perf_counter()
+    reports = simulate(strategies, args.mornings, model, seed=args.seed)
+    print(f"{'strategy':<52} {'hit':>6} {'ttl p50':>8} {'ttl p90':>8} {'reqs':>7}")
+    for report in reports:
+        s = report.summary()
+        print(
+            f"{report.strategy.label:<52} {s['hit_rate']:6.1%} {s['ttl_median']:7.2f}s "
+            f"{s['ttl_p90']:7.2f}s {s['requests_mean']:7.1f}"
+        )
+    print(f"{len(strategies) * args.mornings} mornings in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Library API: stream open tee times as they appear, then hold the ones you want.
+
+    async with httpx.AsyncClient() as client:
+        slots = watch_tee_times(["9710", "9714"], ["2026-11-09"], ("07:00", "10:00"), client=client)
+        async with contextlib.aclosing(slots):
+            async for slot in slots:
+                if await hold_tee_time(slot, login_session, cart_session, client=client):
+                    break
+
+:func:`watch_tee_times` polls every (facility, date) sheet concurrently with the same
+conditional requests as the cancellation watch and yields each slot in the window
+once, when it appears (again after it was gone). Found slots wait in a bounded buffer:
+when the consumer falls behind, the pollers block instead of piling up results.
+Closing or cancelling the iterator stops every poller. :func:`hold_tee_time` runs the
+CLI's lock+cart sequence (with transient retries) for one slot; the sessions come from
+a browser login (:func:`london_golf.browser.do_login_and_get_sessions`).
+"""
+
+import asyncio
+import contextlib
+import datetime as dt
+import logging
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterable, List, Optional, Set, Tuple, Union
+
+import httpx
+
+from london_golf.api_client import SUCCESS, create_client, poll_tee_times
+from london_golf.constants import MAX_CONCURRENT_SEARCHES, POLL_INTERVAL, STREAM_BUFFER
+from london_golf.lease import LeaseManager
+from london_golf.logging_config import get_logger
+from london_golf.models import Candidate, TeeTime
+from london_golf.schedule import BookingSession, booking_window, lock_and_cart, window_candidates
+
+
+@dataclass(frozen=True)
+class Slot:
+    """One open foursome inside the requested window."""
+
+    facility: str
+    book_date: str
+    tee: TeeTime
+    eastern: dt.datetime
+
+    @property
+    def east_hm(self) -> str:
+        return self.eastern.strftime("%H:%M")
+
+
+class _PollerFailed:  # pylint: disable=too-few-public-methods
+    """Queue item carrying a poller's unexpected exception to the consumer."""
+
+    def __init__(self, exc: BaseException) -> None:
+        self.exc = exc
+
+
+def _window_minutes(window: Tuple[str, str]) -> int:
+    start, end = (dt.datetime.strptime(t, "%H:%M") for t in window)
+    minutes = int((end - start).total_seconds() // 60)
+    if minutes < 0:
+        raise ValueError(f"window ends before it starts: {window[0]}-{window[1]}")
+    return minutes
+
+
+async def _poll_sheet(
+    client: httpx.AsyncClient,
+    facility: str,
+    book_date: str,
+    span: Tuple[str, str],
+    log: logging.Logger,
+    out: "asyncio.Queue[Union[Slot, _PollerFailed]]",
+    gate: asyncio.Semaphore,
+    interval: float,
+) -> None:
+    etag: Optional[str] = None
+    digest: Optional[str] = None
+    open_keys: Set[str] = set()
+    try:
+        while True:
+            async with gate:
+                poll = await poll_tee_times(
+                    client, facility, book_date, log, etag=etag, digest=digest
+                )
+            etag, digest = poll.etag, poll.digest
+            if poll.changed:
+                candidates: List[Candidate] = window_candidates(poll.tee_times, span)
+                current = {c.validation_key for c in candidates}
+                for c in candidates:
+                    if c.validation_key not in open_keys:
+                        # Blocks while the buffer is full: backpressure on the poller.
+                        await out.put(Slot(facility, book_date, c.tee, c.eastern))
+                open_keys = current
+            await asyncio.sleep(interval)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # pylint: disable=broad-except
+        await out.put(_PollerFailed(exc))
+
+
+async def watch_tee_times(
+    facilities: Iterable[Union[str, int]],
+    dates: Iterable[Union[str, dt.date]],
+    window: Tuple[str, str] = ("00:00", "23:59"),
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    interval: float = POLL_INTERVAL,
+    buffer: int = STREAM_BUFFER,
+    max_concurrency: int = MAX_CONCURRENT_SEARCHES,
+) -> AsyncIterator[Slot]:
+    """Yield open slots between ``window`` (``HH:MM`` US/Eastern) on every facility and date.
+
+    Runs until the iterator is closed or the consuming task is cancelled. Without
+    ``client`` a private one is created and closed with the iterator.
+    """
+    log = get_logger()
+    minutes = _window_minutes(window)
+    days = [d.isoformat() if isinstance(d, dt.date) else str(d) for d in dates]
+    codes = [str(f) for f in facilities]
+    out: "asyncio.Queue[Union[Slot, _PollerFailed]]" = asyncio.Queue(maxsize=max(1, buffer))
+    gate = asyncio.Semaphore(max_concurrency)
+
+    async with contextlib.AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(create_client())
+        pollers = [
+            asyncio.create_task(
+                _poll_sheet(
+                    client,
+                    code,
+                    day,
+                    booking_window(day, window[0], minutes),
+                    log,
+                    out,
+                    gate,
+                    interval,
+                ),
+                name=f"stream-{code}-{day}",
+            )
+            for code in codes
+            for day in days
+        ]
+        try:
+            while True:
+                item = await out.get()
+                if isinstance(item, _PollerFailed):
+                    raise item.exc
+                yield item
+        finally:
+            for poller in pollers:
+                poller.cancel()
+            await asyncio.gather(*pollers, return_exceptions=True)
+
+
+async def hold_tee_time(
+    slot: Slot,
+    login_session: str,
+    cart_session: str,
+    *,
+    client: Optional[httpx.AsyncClient] = None,
+    leases: Optional[LeaseManager] = None,
+) -> bool:
+    """Lock ``slot`` and put it in the cart; True if it is held.
+
+    The sequence gets ``HOLD_DEADLINE`` seconds (less if the caller's deadline is
+    sooner). With ``leases`` the lock is kept refreshed until the lease manager
+    completes or releases it; a slot that cannot be carted is released either way.
+    """
+    log = get_logger()
+    async with contextlib.AsyncExitStack() as stack:
+        if client is None:
+            client = await stack.enter_async_context(create_client())
+        session = BookingSession(
+            client=client,
+            login_session=login_session,
+            cart_session=cart_session,
+            log=log,
+            leases=leases,
+            label=f"STREAM {slot.facility}",
+        )
+        outcome = await lock_and_cart(session, slot.tee, slot.east_hm)
+    return outcome == SUCCESS
@@ -0,0 +1,215 @@
+"""Multi-process runner for ``--workers N``: shard tasks across processes, restart crashes.
+
+Each worker process gets its own event loop and browser and runs its shard of tasks
+concurrently. Tasks that log in with the same account stay in one shard, so an account's
+session is never used from two processes. Workers report each task's :class:`TaskResult`
+over a pipe as soon as the task finishes, and a :class:`TaskStage` when it first holds a
+lock or starts checkout. A worker that dies is restarted with its unfinished tasks, at most
+``WORKER_MAX_RESTARTS`` times per shard; a task that had reached hold or checkout is never
+restarted, since it may already have booked a tee time on its account.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Union
+
+from london_golf.config_loader import AppConfig, get_task_auth_key
+from london_golf.constants import WORKER_MAX_RESTARTS
+from london_golf.exceptions import ConfigError
+from london_golf.logging_config import get_logger
+
+
+@dataclass
+class TaskResult:
+    """Outcome of one task, as reported by the worker that ran it."""
+
+    task: str
+    found: bool
+    elapsed: float
+    worker: int
+    pid: int
+    error: Optional[str] = None
+
+
+@dataclass
+class TaskStage:
+    """A task reached a stage (``"hold"`` or ``"checkout"``) that must not be repeated."""
+
+    task: str
+    stage: str
+    pid: int
+
+
+def shard_tasks(config: AppConfig, tasks: List[str], workers: int) -> List[List[str]]:
+    """Split ``tasks`` into at most ``workers`` shards, keeping each account in one shard.
+
+    Accounts are placed largest first on the currently smallest shard. Raises
+    ``ConfigError`` for a task that is not in the config.
+    """
+    by_account: Dict[str, List[str]] = defaultdict(list)
+    for task in tasks:
+        by_account[get_task_auth_key(config, task)].append(task)
+    shards: List[List[str]] = [[] for _ in range(max(1, min(workers, len(by_account))))]
+    for group in sorted(by_account.values(), key=len, reverse=True):
+        min(shards, key=len).extend(group)
+    return shards
+
+
+def _worker_main(
+    worker: int,
+    tasks: List[str],
+    args: argparse.Namespace,
+    reports: "multiprocessing.SimpleQueue[Union[TaskResult, TaskStage]]",
+) -> None:
+    # Imported in the child: the CLI pulls in Playwright and the whole booking stack.
+    # pylint: disable=import-outside-toplevel
+    from london_golf.cli import run_tasks
+
+    pid = os.getpid()
+    # SimpleQueue writes to the pipe before put() returns, so a report is not lost
+    # when the process dies right after it.
+    asyncio.run(
+        run_tasks(
+            args,
+            tasks,
+            worker=worker,
+            on_result=reports.put,
+            on_stage=lambda task, stage: reports.put(TaskStage(task, stage, pid)),
+        )
+    )
+
+
+def run_supervisor(
+    args: argparse.Namespace, config: AppConfig, tasks: List[str], workers: int
+) -> List[TaskResult]:
+    """Run ``tasks`` in up to ``workers`` processes; return one result per task."""
+    log = get_logger()
+    ctx = multiprocessing.get_context("spawn")
+    reports: "multiprocessing.SimpleQueue[Union[TaskResult, TaskStage]]" = ctx.SimpleQueue()
+    results: Dict[str, TaskResult] = {}
+    stages: Dict[str, str] = {}
+    # Unknown tasks fail up front, as they would in-process, instead of reaching a worker.
+    runnable = []
+    for task in tasks:
+        try:
+            get_task_auth_key(config, task)
+        except ConfigError as exc:
+            log.info("[SUPERVISOR] task=%s rejected: %s", task, exc)
+            results[task] = TaskResult(task, False, 0.0, -1, os.getpid(), error=repr(exc))
+        else:
+            runnable.append(task)
+    shards = shard_tasks(config, runnable, workers) if runnable else []
+    restarts = [0] * len(shards)
+    running: Dict[int, multiprocessing.Process] = {}
+    started = time.monotonic()
+
+    def _start(worker: int, shard: List[str]) -> None:
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(worker, shard, args, reports),
+            name=f"london-golf-worker-{worker}",
+        )
+        proc.start()
+        running[worker] = proc
+        log.info("[SUPERVISOR] worker %s pid=%s tasks=%s", worker, proc.pid, ",".join(shard))
+
+    def _drain() -> None:
+        while not reports.empty():
+            report = reports.get()
+            if isinstance(report, TaskStage):
+                stages[report.task] = report.stage
+                log.info(
+                    "[SUPERVISOR] task=%s reached %s (pid=%s)",
+                    report.task,
+                    report.stage,
+                    report.pid,
+                )
+            else:
+                results[report.task] = report
+
+    for worker, shard in enumerate(shards):
+        _start(worker, shard)
+
+    while running:
+        wait([proc.sentinel for proc in running.values()], timeout=1.0)
+        _drain()
+        for worker, proc in list(running.items()):
+            if proc.is_alive():
+                continue
+            proc.join()
+            del running[worker]
+            # Results can still be in flight right after the process exits.
+            _drain()
+            unfinished = [task for task in shards[worker] if task not in results]
+            # A task that held a lock may have booked; running it again could book twice.
+            for task in (t for t in unfinished if t in stages):
+                log.info(
+                    "[SUPERVISOR] task=%s not restarted: worker %s exited during %s",
+                    task,
+                    worker,
+                    stages[task],
+                )
+                results[task] = TaskResult(
+                    task,
+                    False,
+                    0.0,
+                    worker,
+                    proc.pid or 0,
+                    error=f"worker exited with {proc.exitcode} during {stages[task]}; not restarted",
+                )
+            unfinished = [task for task in unfinished if task not in stages]
+            if not unfinished:
+                continue
+            if proc.exitcode != 0 and restarts[worker] < WORKER_MAX_RESTARTS:
+                restarts[worker] += 1
+                log.info(
+                    "[SUPERVISOR] worker %s exited with %s; restart %s/%s for %s",
+                    worker,
+                    proc.exitcode,
+                    restarts[worker],
+                    WORKER_MAX_RESTARTS,
+                    ",".join(unfinished),
+                )
+                shards[worker] = unfinished
+                _start(worker, unfinished)
+                continue
+            for task in unfinished:
+                results[task] = TaskResult(
+                    task,
+                    False,
+                    0.0,
+                    worker,
+                    proc.pid or 0,
+                    error=f"worker exited with {proc.exitcode}",
+                )
+
+    ordered = [results[task] for task in tasks]
+    _log_summary(log, ordered, restarts, time.monotonic() - started)
+    return ordered
+
+
+def _log_summary(log, results: List[TaskResult], restarts: List[int], elapsed: float) -> None:
+    for result in results:
+        log.info(
+            "[SUPERVISOR] task=%s worker=%s pid=%s found=%s elapsed=%.1fs%s",
+            result.task,
+            result.worker,
+            result.pid,
+            result.found,
+            result.elapsed,
+            f" error={result.error}" if result.error else "",
+        )
+    log.info(
+        "[SUPERVISOR] %s/%s tasks booked in %.1fs across %s workers (%s restarts)",
+        sum(r.found for r in results),
+        len(results),
+        elapsed,
+        len(restarts),
+        sum(restarts),
+    )
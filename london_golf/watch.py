@@ -0,0 +1,212 @@
+"""Cancellation watcher: track many (facility, date, window) targets for hours.
+
+Each target re-polls its tee sheet with :func:`poll_tee_times`, which skips JSON
+decoding when the sheet is unchanged, and backs off while the sheet stays quiet.
+A matching fresh slot goes straight through the normal lock+cart path.
+"""
+
+import asyncio
+import datetime as dt
+import logging
+import secrets
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from london_golf.api_client import poll_tee_times
+from london_golf.cache import get_cache
+from london_golf.config_loader import AppConfig, TaskScheduleRow
+from london_golf.constants import (
+    BOOK_INTERVAL,
+    MAX_CONCURRENT_SEARCHES,
+    WATCH_BACKOFF,
+    WATCH_MAX_INTERVAL,
+    WATCH_MIN_INTERVAL,
+    WEEKDAY,
+)
+from london_golf.lease import LeaseManager
+from london_golf.models import TeeTime
+from london_golf.schedule import (
+    BookingQuota,
+    TeeSearchContext,
+    book_candidates,
+    search_context,
+    window_candidates,
+)
+
+_JITTER = secrets.SystemRandom()
+
+
+@dataclass
+class WatchTarget:
+    """One watched tee sheet plus its conditional-request and pacing state."""
+
+    ctx: TeeSearchContext
+    etag: Optional[str] = None
+    digest: Optional[str] = None
+    interval: float = WATCH_MIN_INTERVAL
+    polls: int = 0
+    changes: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.ctx.state['picked_course']} {self.ctx.book_date}"
+
+
+def _watch_dates(
+    tasks_dict: Dict[str, TaskScheduleRow], horizon_days: int
+) -> List[Tuple[str, TaskScheduleRow, str]]:
+    """Return ``(weekday, row, date)`` for every upcoming date a row applies to."""
+    today = dt.date.today()
+    out = []
+    for weekday, row in tasks_dict.items():
+        if not row.book_date:
+            continue
+        for day in row.book_date:
+            parsed = dt.date.fromisoformat(day)
+            if parsed > today and WEEKDAY[parsed.weekday()] == weekday:
+                out.append((weekday, row, day))
+    for offset in range(1, horizon_days + 1):
+        day = today + dt.timedelta(days=offset)
+        weekday = WEEKDAY[day.weekday()]
+        row = tasks_dict.get(weekday)
+        if row is None or row.book_date:
+            continue
+        out.append((weekday, row, day.strftime("%Y-%m-%d")))
+    return out
+
+
+def build_watch_targets(
+    client: httpx.AsyncClient,
+    config: AppConfig,
+    task_name: str,
+    tasks_dict: Dict[str, TaskScheduleRow],
+    cart_session: str,
+    login_session: str,
+    log: logging.Logger,
+    horizon_days: int = BOOK_INTERVAL,
+    leases: Optional[LeaseManager] = None,
+) -> List[WatchTarget]:
+    """One target per (course, date) for every schedule row within the horizon."""
+    cache = get_cache(config, log)
+    quotas: Dict[int, BookingQuota] = {}
+    targets = []
+    for weekday, row, book_date in _watch_dates(tasks_dict, horizon_days):
+        quota = quotas.setdefault(id(row), BookingQuota(row.book_count))
+        courses = [row.course] if isinstance(row.course, str) else row.course
+        for picked in dict.fromkeys(courses):
+            ctx = search_context(
+                client,
+                row,
+                config,
+                picked,
+                book_date,
+                task_name=task_name,
+                worker_id=weekday,
+                cart_session=cart_session,
+                login_session=login_session,
+                log=log,
+                cache=cache,
+                quota=quota,
+                leases=leases,
+            )
+            targets.append(WatchTarget(ctx=ctx))
+    return targets
+
+
+async def _watch_target(
+    target: WatchTarget,
+    deadline: float,
+    booked: asyncio.Event,
+    gate: asyncio.Semaphore,
+    selected: List[TeeTime],
+) -> None:
+    ctx = target.ctx
+    loop = asyncio.get_running_loop()
+    task = ctx.task_column.strip()
+    # Spread first polls so targets do not hit the API in lockstep.
+    await asyncio.sleep(_JITTER.uniform(0, target.interval))
+    while not booked.is_set() and loop.time() < deadline:
+        async with gate:
+            poll = await poll_tee_times(
+                ctx.client,
+                str(ctx.state["courseCode"]),
+                ctx.book_date,
+                ctx.log,
+                etag=target.etag,
+                digest=target.digest,
+            )
+        target.polls += 1
+        target.etag, target.digest = poll.etag, poll.digest
+        if not poll.changed:
+            target.interval = min(target.interval * WATCH_BACKOFF, WATCH_MAX_INTERVAL)
+        else:
+            target.changes += 1
+            target.interval = WATCH_MIN_INTERVAL
+            candidates = window_candidates(poll.tee_times, ctx.window, ctx.cache)
+            fresh = sum(not c.cached for c in candidates)
+            if fresh and ctx.quota.remaining > 0 and not booked.is_set():
+                ctx.log.info(
+                    "[%s] Watch: %s opened %s slot(s) in window",
+                    task,
+                    target.label,
+                    fresh,
+                )
+                if await book_candidates(ctx, candidates, selected):
+                    booked.set()
+                    return
+        remaining = deadline - loop.time()
+        await asyncio.sleep(max(0.0, min(target.interval * _JITTER.uniform(0.9, 1.1), remaining)))
+
+
+async def watch_for_cancellations(
+    targets: List[WatchTarget],
+    hours: float,
+    log: logging.Logger,
+    task_name: str,
+    max_concurrency: int = MAX_CONCURRENT_SEARCHES,
+) -> List[TeeTime]:
+    """Watch ``targets`` for up to ``hours``; return tee times booked on the first match."""
+    if not targets:
+        log.info("[%s] Watch: no upcoming dates to watch.", task_name)
+        return []
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + hours * 3600
+    booked = asyncio.Event()
+    gate = asyncio.Semaphore(max_concurrency)
+    selected: List[TeeTime] = []
+    quotas = {id(t.ctx.quota): t.ctx.quota for t in targets}.values()
+    log.info(
+        "[%s] Watch: tracking %s targets for %.1fh (%s)",
+        task_name,
+        len(targets),
+        hours,
+        ", ".join(t.label for t in targets),
+    )
+
+    pending = {
+        asyncio.create_task(_watch_target(t, deadline, booked, gate, selected), name=t.label)
+        for t in targets
+    }
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+            # Let in-flight lock+cart sequences on other targets finish before cancelling.
+            if booked.is_set() and all(q.in_flight == 0 for q in quotas):
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    log.info(
+        "[%s] Watch finished. Polls: %s, sheet changes: %s, Selected: %s",
+        task_name,
+        sum(t.polls for t in targets),
+        sum(t.changes for t in targets),
+        len(selected),
+    )
+    return selected